@@ -0,0 +1,25 @@
+"""add pipeline version spec hash
+
+Revision ID: 0002_pipeline_version_spec_hash
+Revises: 0001_initial_management_plane
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0002_pipeline_version_spec_hash"
+down_revision = "0001_initial_management_plane"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("pipeline_versions", sa.Column("spec_hash", sa.String(length=32), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("pipeline_versions", "spec_hash")
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import cached_property
 
 from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
@@ -19,7 +20,7 @@ class CurrentUser:
     user: User
     roles: list[RoleName]
 
-    @property
+    @cached_property
     def context(self) -> AuthContext:
         return AuthContext(self.user.id, self.roles)
 
@@ -33,7 +33,6 @@ from app.services.rbac import (
     assert_pipeline_access,
     assert_pipeline_write_access,
     assert_roles,
-    get_user_team_ids,
 )
 from app.services.spec_diff import build_structured_diff
 from app.services.stage_registry import list_templates
@@ -534,7 +533,7 @@ def pipeline_access_summary(
     current_user: CurrentUser = Depends(get_current_user),
 ) -> dict:
     pipeline = assert_pipeline_access(db, current_user.context, pipeline_id, write=False)
-    team_ids = sorted(get_user_team_ids(db, current_user.user.id))
+    team_ids = sorted(current_user.context.team_ids(db))
 
     return {
         "pipeline_id": pipeline.id,
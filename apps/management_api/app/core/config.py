@@ -25,6 +25,9 @@ class Settings(BaseSettings):
     ray_mode: Literal["local", "k8s"] = "local"
     ray_address: str = "auto"
     runner_max_workers: int = 4
+    runner_commit_interval: int = 10
+    runner_log_flush_size: int = 64
+    runner_log_flush_interval_ms: int = 50
 
     frontend_origin: str = "http://localhost:3000"
 
@@ -114,6 +114,7 @@ class PipelineVersion(Base):
     )
     is_active: Mapped[bool] = mapped_column(Boolean, default=False, index=True)
     spec_json: Mapped[dict[str, Any]] = mapped_column(JsonType)
+    spec_hash: Mapped[str | None] = mapped_column(String(32), nullable=True)
     change_summary: Mapped[str] = mapped_column(Text, default="")
     created_by: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"))
     review_requested_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
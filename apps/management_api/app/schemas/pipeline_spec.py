@@ -63,6 +63,7 @@ class RuntimeConfig(BaseModel):
     autoscaling: dict[str, Any] = Field(default_factory=dict)
     retry_policy: dict[str, Any] = Field(default_factory=dict)
     distributed_mode: Literal["auto", "always", "never"] = "never"
+    max_parallel_stages: int = Field(default=1, ge=1)
 
 
 class ObservabilityConfig(BaseModel):
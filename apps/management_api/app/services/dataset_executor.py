@@ -7,12 +7,15 @@ import tempfile
 import threading
 import time
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from inspect import signature
 from types import ModuleType
 from typing import Any, Callable
 
 from app.schemas.pipeline_spec import PipelineSpecDocument, StageDefinition
+from app.services.dataset_stages import FrameTransformStage
 from app.services.dataset_types import DatasetRef, DatasetRuntimeContext, DatasetStage
 
 _RUNTIME_INIT_LOCK = threading.Lock()
@@ -41,25 +44,33 @@ def _load_stage_class(python_import_path: str) -> type[Any]:
     return getattr(module, class_name)
 
 
-def _instantiate_dataset_stage(stage: StageDefinition) -> Any:
+@lru_cache(maxsize=256)
+def _resolve_stage_class(stage_template: str | None, python_import_path: str | None) -> type[Any]:
     from app.services.stage_registry import get_template_class
 
+    if stage_template:
+        return get_template_class(stage_template)
+    assert python_import_path is not None
+    return _load_stage_class(python_import_path)
+
+
+# Stage classes that only accept keyword params, so later instantiations skip the positional attempt.
+_KEYWORD_PARAM_STAGE_CLASSES: set[type[Any]] = set()
+
+
+def _instantiate_dataset_stage(stage: StageDefinition) -> Any:
+    cls = _resolve_stage_class(stage.stage_template, stage.python_import_path)
+    params = stage.params or {}
+
     instance: Any
-    if stage.stage_template:
-        cls = get_template_class(stage.stage_template)
-        params = stage.params or {}
-        try:
-            instance = cls(params)
-        except TypeError:
-            instance = cls(**params)
+    if cls in _KEYWORD_PARAM_STAGE_CLASSES:
+        instance = cls(**params)
     else:
-        assert stage.python_import_path is not None
-        cls = _load_stage_class(stage.python_import_path)
-        params = stage.params or {}
         try:
             instance = cls(params)
         except TypeError:
             instance = cls(**params)
+            _KEYWORD_PARAM_STAGE_CLASSES.add(cls)
 
     if not isinstance(instance, DatasetStage):
         raise ValueError(f"Dataset pipeline stage {stage.stage_id} must subclass DatasetStage")
@@ -276,24 +287,28 @@ def _maybe_init_ray_and_daft(ctx: Any, log: Callable[[str], None]) -> None:
 
 def _topological_order(spec: PipelineSpecDocument) -> tuple[list[str], dict[str, list[str]], dict[str, list[str]]]:
     stage_ids = [stage.stage_id for stage in spec.stages]
+    index_of = {stage_id: idx for idx, stage_id in enumerate(stage_ids)}
     incoming: dict[str, list[str]] = {stage_id: [] for stage_id in stage_ids}
     adjacency: dict[str, list[str]] = {stage_id: [] for stage_id in stage_ids}
-    indegree = {stage_id: 0 for stage_id in stage_ids}
+    # Kahn's algorithm runs over integer indices; the id-keyed maps are only built for callers.
+    successors: list[list[int]] = [[] for _ in stage_ids]
+    indegree = [0] * len(stage_ids)
 
     for edge in spec.edges:
         adjacency[edge.source].append(edge.target)
         incoming[edge.target].append(edge.source)
-        indegree[edge.target] += 1
+        target = index_of[edge.target]
+        successors[index_of[edge.source]].append(target)
+        indegree[target] += 1
 
-    queue = deque([stage_id for stage_id in stage_ids if indegree[stage_id] == 0])
+    queue = deque(idx for idx, degree in enumerate(indegree) if degree == 0)
     order: list[str] = []
-    local_indegree = indegree.copy()
     while queue:
         node = queue.popleft()
-        order.append(node)
-        for nxt in adjacency[node]:
-            local_indegree[nxt] -= 1
-            if local_indegree[nxt] == 0:
+        order.append(stage_ids[node])
+        for nxt in successors[node]:
+            indegree[nxt] -= 1
+            if indegree[nxt] == 0:
                 queue.append(nxt)
 
     if len(order) != len(stage_ids):
@@ -301,6 +316,57 @@ def _topological_order(spec: PipelineSpecDocument) -> tuple[list[str], dict[str,
     return order, adjacency, incoming
 
 
+def _topological_layers(order: list[str], incoming: dict[str, list[str]]) -> list[list[str]]:
+    depth: dict[str, int] = {}
+    layers: list[list[str]] = []
+    for stage_id in order:
+        level = max((depth[upstream_id] + 1 for upstream_id in incoming[stage_id]), default=0)
+        depth[stage_id] = level
+        if level == len(layers):
+            layers.append([])
+        layers[level].append(stage_id)
+    return layers
+
+
+def _fused_stage_ids(
+    spec: PipelineSpecDocument,
+    stage_instances: dict[str, Any],
+    adjacency: dict[str, list[str]],
+    incoming: dict[str, list[str]],
+) -> set[str]:
+    """Stages whose frame is handed straight to their only downstream stage instead of written to Lance."""
+    fused: set[str] = set()
+    for stage in spec.stages:
+        downstream = adjacency[stage.stage_id]
+        if len(downstream) != 1 or len(incoming[downstream[0]]) != 1 or len(incoming[stage.stage_id]) != 1:
+            continue
+        if (stage.params or {}).get("output_uri"):
+            continue
+        if isinstance(stage_instances[stage.stage_id], FrameTransformStage) and isinstance(
+            stage_instances[downstream[0]], FrameTransformStage
+        ):
+            fused.add(stage.stage_id)
+    return fused
+
+
+def _with_fused_stage(inputs: dict[str, DatasetRef], stage_id: str, instance: Any) -> dict[str, DatasetRef]:
+    """Record a fused stage on the refs passed downstream so the writing stage's output path reflects it."""
+    return {
+        upstream_id: DatasetRef(
+            uri=ref.uri,
+            format=ref.format,
+            metadata={
+                **ref.metadata,
+                "fused_stages": [
+                    *ref.metadata.get("fused_stages", []),
+                    [stage_id, instance.stage_name, instance.params],
+                ],
+            },
+        )
+        for upstream_id, ref in inputs.items()
+    }
+
+
 def run_dataset_pipeline(
     spec: PipelineSpecDocument,
     log: Callable[[str], None],
@@ -317,29 +383,68 @@ def run_dataset_pipeline(
 
     outputs: dict[str, Any] = {}
     metrics: list[dict[str, Any]] = []
+    fused = _fused_stage_ids(spec, stage_instances, adjacency, incoming)
+    pending_frames: dict[str, tuple[Any, dict[str, DatasetRef]]] = {}
 
-    for stage_id in order:
+    def _run_stage(stage_id: str) -> dict[str, Any]:
         upstream_ids = incoming[stage_id]
-        stage_inputs = {upstream_id: outputs[upstream_id] for upstream_id in upstream_ids}
+        instance = stage_instances[stage_id]
 
         stage_start = time.perf_counter()
-        output_ref = stage_instances[stage_id].run(ctx, stage_inputs)
+        if upstream_ids and upstream_ids[0] in pending_frames:
+            df, stage_inputs = pending_frames.pop(upstream_ids[0])
+        else:
+            df = None
+            stage_inputs = {upstream_id: outputs[upstream_id] for upstream_id in upstream_ids}
+
+        if stage_id in fused:
+            if df is None:
+                df = instance.read_frame(ctx, stage_inputs)
+            pending_frames[stage_id] = (
+                instance.transform(ctx, df),
+                _with_fused_stage(stage_inputs, stage_id, instance),
+            )
+            stage_duration = time.perf_counter() - stage_start
+            log(f"Dataset stage {stage_id} fused into {adjacency[stage_id][0]} in {stage_duration:.3f}s")
+            return {
+                "stage_id": stage_id,
+                "duration_seconds": round(stage_duration, 4),
+                "input_count": len(stage_inputs),
+                "fused_into": adjacency[stage_id][0],
+            }
+
+        if df is not None:
+            output_ref = instance.run_frame(ctx, stage_inputs, df)
+        else:
+            output_ref = instance.run(ctx, stage_inputs)
         stage_duration = time.perf_counter() - stage_start
 
         if not isinstance(output_ref, DatasetRef):
             raise ValueError(f"Dataset stage {stage_id} must return DatasetRef")
 
         outputs[stage_id] = output_ref
-        metrics.append(
-            {
-                "stage_id": stage_id,
-                "duration_seconds": round(stage_duration, 4),
-                "input_count": len(stage_inputs),
-                "output_uri": output_ref.uri,
-                "output_format": output_ref.format,
-            }
-        )
         log(f"Dataset stage {stage_id} completed in {stage_duration:.3f}s -> {output_ref.uri}")
+        return {
+            "stage_id": stage_id,
+            "duration_seconds": round(stage_duration, 4),
+            "input_count": len(stage_inputs),
+            "output_uri": output_ref.uri,
+            "output_format": output_ref.format,
+        }
+
+    max_parallel = spec.runtime.max_parallel_stages
+    if max_parallel <= 1:
+        for stage_id in order:
+            metrics.append(_run_stage(stage_id))
+    else:
+        # Stages within a layer have no edges between them, so independent branches run
+        # concurrently; each layer is awaited before the next one starts.
+        with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+            for layer in _topological_layers(order, incoming):
+                if len(layer) == 1:
+                    metrics.append(_run_stage(layer[0]))
+                else:
+                    metrics.extend(pool.map(_run_stage, layer))
 
     leaves = [stage_id for stage_id, downstream in adjacency.items() if not downstream]
     if len(leaves) != 1:
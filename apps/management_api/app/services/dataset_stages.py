@@ -2,10 +2,15 @@ from __future__ import annotations
 
 import hashlib
 import json
-import random
+import operator
+import os
 import re
+import shutil
+import weakref
+from abc import abstractmethod
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
 from urllib.parse import unquote, urlparse
 
 from app.services.dataset_types import DatasetRef, DatasetRuntimeContext, DatasetStage
@@ -20,11 +25,17 @@ def _require_daft() -> Any:
 
 
 def _stable_signature(stage_name: str, params: dict[str, Any], inputs: dict[str, DatasetRef]) -> str:
-    payload = {
+    payload: dict[str, Any] = {
         "stage": stage_name,
         "params": params,
         "inputs": [(stage_id, ref.uri, ref.format) for stage_id, ref in sorted(inputs.items())],
     }
+    # A frame handed over by fused stages is not the input URI itself, so its chain is part of the identity.
+    fused_chains = {
+        stage_id: ref.metadata["fused_stages"] for stage_id, ref in inputs.items() if "fused_stages" in ref.metadata
+    }
+    if fused_chains:
+        payload["fused_stages"] = fused_chains
     blob = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
     return hashlib.sha1(blob).hexdigest()[:12]
 
@@ -54,9 +65,6 @@ def _resolve_write_target(raw_output_uri: str) -> str:
 
 
 def _is_external_uri(uri: str) -> bool:
-    parsed = urlparse(uri)
-    if parsed.scheme and parsed.scheme != "file":
-        return True
     return "://" in uri and not uri.startswith("file://")
 
 
@@ -104,17 +112,24 @@ def _resolve_read_source(ctx: DatasetRuntimeContext, uri: str) -> str:
         return unquote(urlparse(uri).path)
 
     for candidate in _local_uri_candidates(ctx, uri):
-        if candidate.exists():
-            return str(candidate)
+        path = str(candidate)
+        # lexists skips following symlinks; confirm only the hit so a dangling link is not chosen.
+        if os.path.lexists(path) and candidate.exists():
+            return path
     return uri
 
 
-def _read_lance(ctx: DatasetRuntimeContext, uri: str) -> Any:
+def _read_lance(ctx: DatasetRuntimeContext, uri: str, columns: list[str] | None = None) -> Any:
     daft = _require_daft()
     resolved_uri = _resolve_read_source(ctx, uri)
     if ctx.io_config is None:
-        return daft.read_lance(resolved_uri)
-    return daft.read_lance(resolved_uri, io_config=ctx.io_config)
+        df = daft.read_lance(resolved_uri)
+    else:
+        df = daft.read_lance(resolved_uri, io_config=ctx.io_config)
+    if columns is None:
+        return df
+    # Daft pushes the projection into the Lance scan, so unselected columns are never read.
+    return df.select(*[column for column in dict.fromkeys(columns) if column in df.column_names])
 
 
 def _write_lance(ctx: DatasetRuntimeContext, df: Any, uri: str, mode: str) -> None:
@@ -124,6 +139,54 @@ def _write_lance(ctx: DatasetRuntimeContext, df: Any, uri: str, mode: str) -> No
     df.write_lance(uri, mode=mode, io_config=ctx.io_config)
 
 
+def _publish_local_lance(ctx: DatasetRuntimeContext, source_uri: str, write_target: str) -> bool:
+    """Commit the latest version of a local Lance dataset at *write_target* without re-encoding it.
+
+    Lance data files are immutable, so they are hard-linked (copied across devices) and committed as an
+    overwrite, which keeps the target's version history like ``write_lance(mode="overwrite")`` would. Returns
+    False when the caller must write through Daft instead: remote URIs, a target that exists but is not a
+    Lance dataset, or fragments carrying deletion files or row id metadata.
+    """
+    if _is_external_uri(source_uri) or _is_external_uri(write_target):
+        return False
+    source_path = Path(_resolve_read_source(ctx, source_uri))
+    if not source_path.is_dir():
+        return False
+    target_path = Path(write_target)
+    if target_path.resolve() == source_path.resolve():
+        return True
+
+    import dataclasses
+
+    import lance  # type: ignore
+
+    try:
+        dataset = lance.dataset(str(source_path))
+        if target_path.exists():
+            lance.dataset(str(target_path))
+    except ValueError:
+        return False
+
+    fragments = [fragment.metadata for fragment in dataset.get_fragments()]
+    if any(fragment.deletion_file is not None or fragment.row_id_meta is not None for fragment in fragments):
+        return False
+
+    data_dir = target_path / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    for fragment in fragments:
+        for data_file in fragment.files:
+            linked = data_dir / data_file.path
+            if linked.exists():
+                continue
+            try:
+                os.link(source_path / "data" / data_file.path, linked)
+            except OSError:
+                shutil.copy2(source_path / "data" / data_file.path, linked)
+    renumbered = [dataclasses.replace(fragment, id=index) for index, fragment in enumerate(fragments)]
+    lance.LanceDataset.commit(str(target_path), lance.LanceOperation.Overwrite(dataset.schema, renumbered))
+    return True
+
+
 def _single_input(inputs: dict[str, DatasetRef], stage_name: str) -> DatasetRef:
     if len(inputs) != 1:
         raise ValueError(f"{stage_name} expects exactly one input")
@@ -139,6 +202,28 @@ def _multi_input(
     return sorted(inputs.items(), key=lambda item: item[0])
 
 
+def _union_frames_by_name(frames: list[Any], *, distinct: bool) -> Any:
+    base_names = list(frames[0].column_names)
+    base_schema = sorted((field.name, str(field.dtype)) for field in frames[0].schema())
+    if all(sorted((field.name, str(field.dtype)) for field in frame.schema()) == base_schema for frame in frames[1:]):
+        # Matching schemas concat directly; aligning names up front avoids per-pair schema reconciliation.
+        aligned = [frames[0], *(frame.select(*base_names) for frame in frames[1:])]
+        combine = "concat"
+    else:
+        aligned = list(frames)
+        combine = "union_all_by_name" if hasattr(frames[0], "union_all_by_name") else "union_by_name"
+
+    # Pair inputs up level by level so the plan stays O(log N) deep instead of a left-deep chain.
+    while len(aligned) > 1:
+        paired = [getattr(left, combine)(right) for left, right in zip(aligned[::2], aligned[1::2])]
+        if len(aligned) % 2:
+            paired.append(aligned[-1])
+        aligned = paired
+
+    union_df = aligned[0]
+    return union_df.distinct() if distinct else union_df
+
+
 def _normalize_join_key(raw_key: Any) -> Any:
     if raw_key is None:
         return None
@@ -152,7 +237,24 @@ def _normalize_join_key(raw_key: Any) -> Any:
     return raw_key
 
 
-def _filter_predicate(params: dict[str, Any]) -> str:
+_FILTER_OPERATORS: dict[str, Callable[[Any, Any], Any]] = {
+    "==": operator.eq,
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+@lru_cache(maxsize=256, typed=True)
+def _compiled_filter_expression(column: str, op: str, value: Any) -> Any:
+    daft = _require_daft()
+    return _FILTER_OPERATORS[op](daft.col(column), value)
+
+
+def _filter_predicate(params: dict[str, Any]) -> Any:
     predicate = params.get("predicate") or params.get("where") or params.get("filter")
     if isinstance(predicate, str) and predicate.strip():
         return predicate.strip()
@@ -161,6 +263,12 @@ def _filter_predicate(params: dict[str, Any]) -> str:
     value = params.get("value")
     op = str(params.get("op", "=="))
     if isinstance(column, str) and column.strip() and "value" in params:
+        if op in _FILTER_OPERATORS:
+            try:
+                return _compiled_filter_expression(column.strip(), op, value)
+            except TypeError:
+                # Unhashable values (lists, dicts) cannot be cached; use the SQL string path.
+                pass
         return f"{column.strip()} {op} {json.dumps(value)}"
 
     raise ValueError("FilterStage requires either `predicate` or (`column`, `op`, `value`) parameters")
@@ -244,6 +352,14 @@ class LanceWriterStage(DatasetStage):
         if not output_uri:
             raise ValueError("LanceWriterStage requires output_uri param or pipeline io.sink.uri")
 
+        metadata = {"writer_stage": True, "source_uri": upstream.uri}
+        write_mode = str(self.params.get("write_mode") or self.params.get("mode") or "overwrite")
+        if upstream.format == "lance" and write_mode == "overwrite":
+            # Publishing an unchanged local Lance dataset only needs its latest fragments, not a decode/encode pass.
+            write_target = _resolve_write_target(output_uri)
+            if _publish_local_lance(ctx, upstream.uri, write_target):
+                return DatasetRef(uri=write_target, format="lance", metadata=metadata)
+
         df = _read_lance(ctx, upstream.uri)
         return _materialize(
             ctx,
@@ -252,7 +368,7 @@ class LanceWriterStage(DatasetStage):
             inputs=inputs,
             df=df,
             output_uri=output_uri,
-            metadata={"writer_stage": True, "source_uri": upstream.uri},
+            metadata=metadata,
         )
 
 
@@ -348,16 +464,7 @@ class UnionByNameStage(DatasetStage):
         frames = [_read_lance(ctx, ref.uri) for _, ref in ordered_inputs]
 
         distinct = bool(self.params.get("distinct", True))
-        union_df = frames[0]
-        for frame in frames[1:]:
-            if distinct:
-                union_df = union_df.union_by_name(frame)
-            else:
-                union_all_by_name = getattr(union_df, "union_all_by_name", None)
-                if callable(union_all_by_name):
-                    union_df = union_all_by_name(frame)
-                else:
-                    union_df = union_df.union_by_name(frame)
+        union_df = _union_frames_by_name(frames, distinct=distinct)
 
         return _materialize(
             ctx,
@@ -411,15 +518,65 @@ class JoinStage(DatasetStage):
         )
 
 
-def _rows_from_df(df: Any) -> list[dict[str, Any]]:
+# Arrow schemas seen by _rows_from_df, so empty outputs can reuse them without re-planning the upstream frame.
+_ARROW_SCHEMAS: weakref.WeakKeyDictionary[Any, Any] = weakref.WeakKeyDictionary()
+
+
+def _arrow_table(df: Any) -> Any:
     table = df.to_arrow()
-    return [dict(row) for row in table.to_pylist()]
+    try:
+        _ARROW_SCHEMAS[df] = table.schema
+    except TypeError:
+        pass
+    return table
+
+
+def _rows_from_df(df: Any) -> list[dict[str, Any]]:
+    return [dict(row) for row in _arrow_table(df).to_pylist()]
+
+
+def _iter_arrow_batches(df: Any, batch_size: int = 8192) -> Iterator[Any]:
+    # to_arrow_iter streams partitions as they are produced instead of collecting the whole table first.
+    for batch in df.to_arrow_iter():
+        try:
+            _ARROW_SCHEMAS.setdefault(df, batch.schema)
+        except TypeError:
+            pass
+        for offset in range(0, batch.num_rows, batch_size):
+            yield batch.slice(offset, batch_size)
+
+
+def _project_column(table: Any, column: str) -> list[Any]:
+    if column not in table.column_names:
+        return [None] * table.num_rows
+    return table.column(column).to_pylist()
+
+
+def _assign_column(table: Any, column: str, values: Any, data_type: Any | None = None) -> Any:
+    import pyarrow as pa
+
+    array = values if isinstance(values, (pa.Array, pa.ChunkedArray)) else pa.array(values, type=data_type)
+    if column in table.column_names:
+        return table.set_column(table.column_names.index(column), column, array)
+    return table.append_column(column, array)
 
 
-def _rows_to_df(rows: list[dict[str, Any]], *, fallback_df: Any | None = None) -> Any:
+def _rows_to_df(
+    rows: list[dict[str, Any]],
+    *,
+    fallback_df: Any | None = None,
+    fallback_schema: Any | None = None,
+) -> Any:
     daft = _require_daft()
     if rows:
         return daft.from_pylist(rows)
+    if fallback_schema is None and fallback_df is not None:
+        try:
+            fallback_schema = _ARROW_SCHEMAS.get(fallback_df)
+        except TypeError:
+            fallback_schema = None
+    if fallback_schema is not None:
+        return daft.from_arrow(fallback_schema.empty_table())
     if fallback_df is not None:
         return fallback_df.limit(0)
     return daft.from_pylist([])
@@ -433,19 +590,71 @@ def _stringify(value: Any) -> str:
     return str(value)
 
 
+def _column_dtype(df: Any, column: str) -> Any | None:
+    if column not in df.column_names:
+        return None
+    return df.schema()[column].dtype
+
+
+def _numpy_rng(seed: Any) -> Any:
+    import numpy as np
+
+    if seed is not None and (not isinstance(seed, int) or seed < 0):
+        seed = int.from_bytes(hashlib.sha256(str(seed).encode("utf-8")).digest()[:8], "big")
+    return np.random.default_rng(seed)
+
+
 def _first_dataset_df(
     ctx: DatasetRuntimeContext,
     inputs: dict[str, DatasetRef],
     stage_name: str,
+    columns: list[str] | None = None,
 ) -> tuple[Any, DatasetRef]:
     upstream = _single_input(inputs, stage_name)
-    return _read_lance(ctx, upstream.uri), upstream
+    return _read_lance(ctx, upstream.uri, columns=columns), upstream
+
+
+class FrameTransformStage(DatasetStage):
+    """Single-input stage whose work is a frame-to-frame transform.
+
+    The dataset executor passes the frame of one such stage straight into the next, so a linear chain of them
+    writes Lance once at the end of the chain instead of after every stage.
+    """
+
+    stage_name = ""
+
+    @abstractmethod
+    def transform(self, ctx: DatasetRuntimeContext, df: Any) -> Any: ...
+
+    def output_metadata(self) -> dict[str, Any]:
+        return {}
+
+    def read_frame(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> Any:
+        return _read_lance(ctx, _single_input(inputs, type(self).__name__).uri)
+
+    def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
+        return self.run_frame(ctx, inputs, self.read_frame(ctx, inputs))
+
+    def run_frame(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef], df: Any) -> DatasetRef:
+        upstream = _single_input(inputs, type(self).__name__)
+        return _materialize(
+            ctx,
+            stage_name=self.stage_name,
+            params=self.params,
+            inputs=inputs,
+            df=self.transform(ctx, df),
+            output_uri=self.params.get("output_uri"),
+            metadata={"source_uri": upstream.uri, **self.output_metadata()},
+        )
 
 
 class SplitterStage(DatasetStage):
     def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
+        import numpy as np
+
+        daft = _require_daft()
         df, upstream = _first_dataset_df(ctx, inputs, "SplitterStage")
-        rows = _rows_from_df(df)
+        table = _arrow_table(df)
 
         mode = str(self.params.get("mode", "mod")).lower()
         partitions = max(1, int(self.params.get("partitions", 2)))
@@ -453,17 +662,17 @@ class SplitterStage(DatasetStage):
         fraction = min(1.0, max(0.0, float(self.params.get("fraction", 0.5))))
 
         if mode == "ratio":
-            cutoff = int(len(rows) * fraction)
-            selected = rows[:cutoff] if partition_id == 0 else rows[cutoff:]
+            cutoff = int(table.num_rows * fraction)
+            selected = table.slice(0, cutoff) if partition_id == 0 else table.slice(cutoff)
         else:
-            selected = [row for idx, row in enumerate(rows) if idx % partitions == partition_id]
+            selected = table.take(np.arange(partition_id, table.num_rows, partitions))
 
         return _materialize(
             ctx,
             stage_name="splitter",
             params=self.params,
             inputs=inputs,
-            df=_rows_to_df(selected, fallback_df=df),
+            df=daft.from_arrow(selected),
             output_uri=self.params.get("output_uri"),
             metadata={"source_uri": upstream.uri, "mode": mode, "partition_id": partition_id, "partitions": partitions},
         )
@@ -472,9 +681,8 @@ class SplitterStage(DatasetStage):
 class VisualizerStage(DatasetStage):
     def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
         df, upstream = _first_dataset_df(ctx, inputs, "VisualizerStage")
-        rows = _rows_from_df(df)
         limit = max(1, int(self.params.get("limit", 20)))
-        preview = rows[:limit]
+        preview = _rows_from_df(df.limit(limit))
 
         output_path = Path(str(self.params.get("preview_path") or f"{ctx.work_dir}/visualizer_preview.json"))
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -508,18 +716,20 @@ class SchemaStage(DatasetStage):
 
 class RowNumberStage(DatasetStage):
     def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
+        import numpy as np
+
+        daft = _require_daft()
         df, upstream = _first_dataset_df(ctx, inputs, "RowNumberStage")
-        rows = _rows_from_df(df)
+        table = _arrow_table(df)
         column = str(self.params.get("column", "row_number"))
         start = int(self.params.get("start", 1))
-        for idx, row in enumerate(rows, start=start):
-            row[column] = idx
+        table = _assign_column(table, column, np.arange(start, start + table.num_rows, dtype=np.int64))
         return _materialize(
             ctx,
             stage_name="row_number",
             params=self.params,
             inputs=inputs,
-            df=_rows_to_df(rows, fallback_df=df),
+            df=daft.from_arrow(table),
             output_uri=self.params.get("output_uri"),
             metadata={"source_uri": upstream.uri, "row_number_column": column},
         )
@@ -527,36 +737,36 @@ class RowNumberStage(DatasetStage):
 
 class StatStage(DatasetStage):
     def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
         df, upstream = _first_dataset_df(ctx, inputs, "StatStage")
-        rows = _rows_from_df(df)
 
         numeric_columns = self.params.get("columns")
         if isinstance(numeric_columns, str):
             numeric_columns = [item.strip() for item in numeric_columns.split(",") if item.strip()]
         if not isinstance(numeric_columns, list):
-            numeric_columns = sorted(
-                {
-                    key
-                    for row in rows
-                    for key, value in row.items()
-                    if isinstance(value, (int, float)) and not isinstance(value, bool)
-                }
-            )
+            schema = df.schema()
+            numeric_columns = sorted(name for name in df.column_names if schema[name].dtype.is_numeric())
+        # Only the measured columns are scanned; the stage output is still the full upstream frame.
+        measured = [column for column in numeric_columns if column in df.column_names]
+        table = _arrow_table(df.select(*measured)) if measured else None
 
         stats: dict[str, dict[str, float]] = {}
         for column in numeric_columns:
-            values = [
-                float(row[column])
-                for row in rows
-                if isinstance(row.get(column), (int, float)) and not isinstance(row.get(column), bool)
-            ]
-            if not values:
+            if table is None or column not in table.column_names:
+                continue
+            field_type = table.schema.field(column).type
+            if not (pa.types.is_integer(field_type) or pa.types.is_floating(field_type)):
+                continue
+            values = pc.cast(table.column(column).drop_null(), pa.float64()).to_numpy()
+            if not len(values):
                 continue
             stats[str(column)] = {
                 "count": float(len(values)),
-                "min": min(values),
-                "max": max(values),
-                "mean": sum(values) / len(values),
+                "min": float(values.min()),
+                "max": float(values.max()),
+                "mean": float(values.sum() / len(values)),
             }
 
         stats_path_raw = self.params.get("stats_path")
@@ -578,8 +788,9 @@ class StatStage(DatasetStage):
 
 class ColumnDropStage(DatasetStage):
     def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
+        daft = _require_daft()
         df, upstream = _first_dataset_df(ctx, inputs, "ColumnDropStage")
-        rows = _rows_from_df(df)
+        table = _arrow_table(df)
         columns = self.params.get("columns") or self.params.get("drop")
         if isinstance(columns, str):
             columns = [item.strip() for item in columns.split(",") if item.strip()]
@@ -587,16 +798,14 @@ class ColumnDropStage(DatasetStage):
             raise ValueError("ColumnDropStage requires columns/drop list")
         to_drop = {str(column) for column in columns}
 
-        for row in rows:
-            for column in to_drop:
-                row.pop(column, None)
+        table = table.drop_columns([column for column in table.column_names if column in to_drop])
 
         return _materialize(
             ctx,
             stage_name="column_drop",
             params=self.params,
             inputs=inputs,
-            df=_rows_to_df(rows, fallback_df=df),
+            df=daft.from_arrow(table),
             output_uri=self.params.get("output_uri"),
             metadata={"source_uri": upstream.uri, "dropped_columns": sorted(to_drop)},
         )
@@ -604,8 +813,9 @@ class ColumnDropStage(DatasetStage):
 
 class ColumnAliasStage(DatasetStage):
     def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
+        daft = _require_daft()
         df, upstream = _first_dataset_df(ctx, inputs, "ColumnAliasStage")
-        rows = _rows_from_df(df)
+        table = _arrow_table(df)
         aliases = self.params.get("aliases")
         if not isinstance(aliases, dict):
             source = self.params.get("source")
@@ -616,17 +826,20 @@ class ColumnAliasStage(DatasetStage):
                 raise ValueError("ColumnAliasStage requires aliases map or source/target")
 
         normalized_aliases = {str(old): str(new) for old, new in aliases.items()}
-        for row in rows:
-            for old, new in normalized_aliases.items():
-                if old in row:
-                    row[new] = row.pop(old)
+        for old, new in normalized_aliases.items():
+            if old not in table.column_names or old == new:
+                continue
+            if new in table.column_names:
+                table = _assign_column(table, new, table.column(old)).drop_columns([old])
+            else:
+                table = table.rename_columns([new if name == old else name for name in table.column_names])
 
         return _materialize(
             ctx,
             stage_name="column_alias",
             params=self.params,
             inputs=inputs,
-            df=_rows_to_df(rows, fallback_df=df),
+            df=daft.from_arrow(table),
             output_uri=self.params.get("output_uri"),
             metadata={"source_uri": upstream.uri, "aliases": normalized_aliases},
         )
@@ -634,19 +847,20 @@ class ColumnAliasStage(DatasetStage):
 
 class FilterByRatioStage(DatasetStage):
     def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
+        import pyarrow as pa
+
+        daft = _require_daft()
         df, upstream = _first_dataset_df(ctx, inputs, "FilterByRatioStage")
-        rows = _rows_from_df(df)
+        table = _arrow_table(df)
         keep_ratio = min(1.0, max(0.0, float(self.params.get("keep_ratio", 0.5))))
-        seed = self.params.get("seed")
-        rng = random.Random(seed)
-        kept_rows = [row for row in rows if rng.random() <= keep_ratio]
+        mask = _numpy_rng(self.params.get("seed")).random(table.num_rows) <= keep_ratio
 
         return _materialize(
             ctx,
             stage_name="filter_by_ratio",
             params=self.params,
             inputs=inputs,
-            df=_rows_to_df(kept_rows, fallback_df=df),
+            df=daft.from_arrow(table.filter(pa.array(mask))),
             output_uri=self.params.get("output_uri"),
             metadata={"source_uri": upstream.uri, "keep_ratio": keep_ratio},
         )
@@ -654,32 +868,39 @@ class FilterByRatioStage(DatasetStage):
 
 class SelectorStage(DatasetStage):
     def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
+        import pyarrow as pa
+
+        daft = _require_daft()
         df, upstream = _first_dataset_df(ctx, inputs, "SelectorStage")
-        rows = _rows_from_df(df)
+        table = _arrow_table(df)
 
         indices = self.params.get("indices")
         if isinstance(indices, list):
-            chosen = [rows[int(idx)] for idx in indices if isinstance(idx, int) and 0 <= idx < len(rows)]
+            valid = [int(idx) for idx in indices if isinstance(idx, int) and 0 <= idx < table.num_rows]
+            chosen = table.take(pa.array(valid, pa.int64()))
         else:
             offset = max(0, int(self.params.get("offset", 0)))
-            limit = max(0, int(self.params.get("limit", len(rows))))
-            chosen = rows[offset : offset + limit]
+            limit = max(0, int(self.params.get("limit", table.num_rows)))
+            chosen = table.slice(min(offset, table.num_rows), limit)
 
         return _materialize(
             ctx,
             stage_name="selector",
             params=self.params,
             inputs=inputs,
-            df=_rows_to_df(chosen, fallback_df=df),
+            df=daft.from_arrow(chosen),
             output_uri=self.params.get("output_uri"),
-            metadata={"source_uri": upstream.uri, "selected_count": len(chosen)},
+            metadata={"source_uri": upstream.uri, "selected_count": chosen.num_rows},
         )
 
 
 class ReorderStage(DatasetStage):
     def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
+        import pyarrow as pa
+
+        daft = _require_daft()
         df, upstream = _first_dataset_df(ctx, inputs, "ReorderStage")
-        rows = _rows_from_df(df)
+        table = _arrow_table(df)
         by = self.params.get("by") or self.params.get("columns")
         if isinstance(by, str):
             columns = [item.strip() for item in by.split(",") if item.strip()]
@@ -696,18 +917,18 @@ class ReorderStage(DatasetStage):
         if len(desc_flags) < len(columns):
             desc_flags.extend([False] * (len(columns) - len(desc_flags)))
 
-        ordered = list(rows)
+        # Sort row positions on the key columns only, then gather every column in that order.
+        order = list(range(table.num_rows))
         for column, is_desc in reversed(list(zip(columns, desc_flags, strict=False))):
-            ordered.sort(
-                key=lambda row: (_stringify(row.get(column)) == "", _stringify(row.get(column))), reverse=is_desc
-            )
+            keys = [(text == "", text) for text in map(_stringify, _project_column(table, column))]
+            order.sort(key=keys.__getitem__, reverse=is_desc)
 
         return _materialize(
             ctx,
             stage_name="reorder",
             params=self.params,
             inputs=inputs,
-            df=_rows_to_df(ordered, fallback_df=df),
+            df=daft.from_arrow(table.take(pa.array(order, pa.int64()))),
             output_uri=self.params.get("output_uri"),
             metadata={"source_uri": upstream.uri, "order_by": columns, "desc": desc_flags},
         )
@@ -715,8 +936,11 @@ class ReorderStage(DatasetStage):
 
 class InterleavedReorderStage(DatasetStage):
     def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
+        import pyarrow as pa
+
+        daft = _require_daft()
         df, upstream = _first_dataset_df(ctx, inputs, "InterleavedReorderStage")
-        rows = _rows_from_df(df)
+        table = _arrow_table(df)
 
         group_by = self.params.get("group_by") or self.params.get("column")
         if isinstance(group_by, str):
@@ -726,29 +950,23 @@ class InterleavedReorderStage(DatasetStage):
         else:
             raise ValueError("InterleavedReorderStage requires group_by/column")
 
-        buckets: dict[tuple[Any, ...], list[dict[str, Any]]] = {}
-        for row in rows:
-            key = tuple(row.get(col) for col in group_columns)
-            buckets.setdefault(key, []).append(row)
-
-        interleaved: list[dict[str, Any]] = []
-        keys = sorted(buckets.keys(), key=lambda item: tuple(_stringify(value) for value in item))
-        while True:
-            added = 0
-            for key in keys:
-                bucket = buckets[key]
-                if bucket:
-                    interleaved.append(bucket.pop(0))
-                    added += 1
-            if added == 0:
-                break
+        buckets: dict[tuple[Any, ...], list[int]] = {}
+        group_values = [_project_column(table, column) for column in group_columns]
+        for idx, key in enumerate(zip(*group_values, strict=True) if group_values else [()] * table.num_rows):
+            buckets.setdefault(key, []).append(idx)
+
+        # Round-robin over the buckets: round N takes the N-th row of every bucket that still has one.
+        ordered_buckets = [buckets[key] for key in sorted(buckets, key=lambda item: tuple(map(_stringify, item)))]
+        interleaved: list[int] = []
+        for round_idx in range(max(map(len, ordered_buckets), default=0)):
+            interleaved.extend(bucket[round_idx] for bucket in ordered_buckets if round_idx < len(bucket))
 
         return _materialize(
             ctx,
             stage_name="interleaved_reorder",
             params=self.params,
             inputs=inputs,
-            df=_rows_to_df(interleaved, fallback_df=df),
+            df=daft.from_arrow(table.take(pa.array(interleaved, pa.int64()))),
             output_uri=self.params.get("output_uri"),
             metadata={"source_uri": upstream.uri, "group_by": group_columns},
         )
@@ -756,28 +974,35 @@ class InterleavedReorderStage(DatasetStage):
 
 class UnionByPositionStage(DatasetStage):
     def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
+        import pyarrow as pa
+
+        daft = _require_daft()
         ordered_inputs = _multi_input(inputs, "UnionByPositionStage")
         frames = [_read_lance(ctx, ref.uri) for _, ref in ordered_inputs]
         if not frames:
             raise ValueError("UnionByPositionStage requires at least one input")
 
         base_columns = list(frames[0].column_names)
-        merged_rows: list[dict[str, Any]] = []
+        aligned: list[Any] = []
         for frame in frames:
-            column_names = list(frame.column_names)
-            for row in _rows_from_df(frame):
-                projected: dict[str, Any] = {}
-                for idx, base_col in enumerate(base_columns):
-                    source_col = column_names[idx] if idx < len(column_names) else base_col
-                    projected[base_col] = row.get(source_col)
-                merged_rows.append(projected)
+            table = _arrow_table(frame)
+            column_names = table.column_names
+            projected = []
+            for idx, base_col in enumerate(base_columns):
+                source_col = column_names[idx] if idx < len(column_names) else base_col
+                if source_col in column_names:
+                    projected.append(table.column(source_col))
+                else:
+                    projected.append(pa.nulls(table.num_rows))
+            aligned.append(pa.table(projected, names=base_columns))
+        merged = pa.concat_tables(aligned, promote_options="permissive")
 
         return _materialize(
             ctx,
             stage_name="union_by_position",
             params=self.params,
             inputs=inputs,
-            df=_rows_to_df(merged_rows, fallback_df=frames[0]),
+            df=daft.from_arrow(merged),
             output_uri=self.params.get("output_uri"),
             metadata={"union_inputs": [stage_id for stage_id, _ in ordered_inputs], "columns": base_columns},
         )
@@ -789,51 +1014,138 @@ class JoinerStage(JoinStage):
 
 class AddConstantsStage(DatasetStage):
     def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
+        import pyarrow as pa
+
+        daft = _require_daft()
         df, upstream = _first_dataset_df(ctx, inputs, "AddConstantsStage")
-        rows = _rows_from_df(df)
+        table = _arrow_table(df)
         constants = self.params.get("constants")
         if not isinstance(constants, dict):
             raise ValueError("AddConstantsStage requires constants map")
-        for row in rows:
-            row.update(constants)
+        for column, value in constants.items():
+            table = _assign_column(table, str(column), [value] * table.num_rows, pa.scalar(value).type)
         return _materialize(
             ctx,
             stage_name="add_constants",
             params=self.params,
             inputs=inputs,
-            df=_rows_to_df(rows, fallback_df=df),
+            df=daft.from_arrow(table),
             output_uri=self.params.get("output_uri"),
             metadata={"source_uri": upstream.uri, "constants": constants},
         )
 
 
+def _is_arrow_string(data_type: Any) -> bool:
+    import pyarrow as pa
+
+    return pa.types.is_string(data_type) or pa.types.is_large_string(data_type)
+
+
+def _conversation_paragraphs(column: Any, separator: str) -> Any | None:
+    """Join conversation turns with Arrow kernels; None means the column needs the Python path."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    column = column.combine_chunks() if isinstance(column, pa.ChunkedArray) else column
+    if _is_arrow_string(column.type):
+        return pc.fill_null(column, "")
+    if not (pa.types.is_list(column.type) or pa.types.is_large_list(column.type)):
+        return None
+
+    offsets = column.offsets
+    start, end = offsets[0].as_py(), offsets[-1].as_py()
+    items = column.values.slice(start, end - start)
+    if _is_arrow_string(items.type):
+        fragments = items
+    elif pa.types.is_struct(items.type):
+        fields = {items.type.field(index).name: index for index in range(items.type.num_fields)}
+        parts = [pc.struct_field(items, [fields[name]]) for name in ("content", "text") if name in fields]
+        if not parts or not all(_is_arrow_string(part.type) for part in parts):
+            return None
+        # Mirrors `item.get("content") or item.get("text")`: empty content falls through to text.
+        fragments = parts[0]
+        for part in parts[1:]:
+            fragments = pc.if_else(pc.fill_null(pc.equal(fragments, ""), True), part, fragments)
+    else:
+        return None
+
+    keep = pc.fill_null(pc.not_equal(fragments, ""), False)
+    kept_before = pa.concat_arrays([pa.array([0], pa.int64()), pc.cumulative_sum(pc.cast(keep, pa.int64()))])
+    joined = pc.binary_join(
+        pa.LargeListArray.from_arrays(
+            pc.take(kept_before, pc.subtract(offsets, start)),
+            pc.filter(fragments, keep).cast(pa.large_string()),
+        ),
+        pa.scalar(separator, pa.large_string()),
+    )
+    # Null conversations stringify to "" just like missing values.
+    return pc.if_else(pc.is_null(column), "", joined)
+
+
+def _non_empty_strings(table: Any, column: str) -> Any:
+    """Return `column` as large strings with empty and missing values as null."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if column not in table.column_names:
+        return pa.nulls(table.num_rows, pa.large_string())
+    values = table.column(column).combine_chunks()
+    if _is_arrow_string(values.type) or pa.types.is_integer(values.type):
+        # str() and Arrow agree on integer formatting; floats, bools and nested values do not.
+        values = pc.cast(values, pa.large_string())
+    elif pa.types.is_boolean(values.type):
+        values = pc.if_else(values, pa.scalar("True", pa.large_string()), pa.scalar("False", pa.large_string()))
+    else:
+        values = pa.array(list(map(_stringify, values.to_pylist())), pa.large_string())
+    return pc.if_else(pc.equal(values, ""), pa.scalar(None, pa.large_string()), values)
+
+
+def _join_non_empty(arrays: list[Any], separator: str) -> Any:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    separator_scalar = pa.scalar(separator, pa.large_string())
+    joined = arrays[0]
+    for values in arrays[1:]:
+        # Element-wise join is null if either side is null; coalesce keeps whichever side is present.
+        joined = pc.coalesce(pc.binary_join_element_wise(joined, values, separator_scalar), joined, values)
+    return pc.fill_null(joined, "")
+
+
 class ConversationToParagraphStage(DatasetStage):
     def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
+        import pyarrow as pa
+
+        daft = _require_daft()
         df, upstream = _first_dataset_df(ctx, inputs, "ConversationToParagraphStage")
-        rows = _rows_from_df(df)
         source_col = str(self.params.get("source_column", "conversation"))
         output_col = str(self.params.get("output_column", "paragraph"))
         separator = str(self.params.get("separator", " "))
 
-        for row in rows:
-            value = row.get(source_col)
-            if isinstance(value, list):
-                fragments: list[str] = []
-                for item in value:
-                    if isinstance(item, dict):
-                        fragments.append(_stringify(item.get("content") or item.get("text")))
-                    else:
-                        fragments.append(_stringify(item))
-                row[output_col] = separator.join(fragment for fragment in fragments if fragment)
-            else:
-                row[output_col] = _stringify(value)
+        table = _arrow_table(df)
+        paragraphs = None
+        if source_col in table.column_names and table.num_rows:
+            paragraphs = _conversation_paragraphs(table.column(source_col), separator)
+        if paragraphs is None:
+            paragraphs = []
+            for value in _project_column(table, source_col):
+                if isinstance(value, list):
+                    fragments: list[str] = []
+                    for item in value:
+                        if isinstance(item, dict):
+                            fragments.append(_stringify(item.get("content") or item.get("text")))
+                        else:
+                            fragments.append(_stringify(item))
+                    paragraphs.append(separator.join(fragment for fragment in fragments if fragment))
+                else:
+                    paragraphs.append(_stringify(value))
 
         return _materialize(
             ctx,
             stage_name="conversation_to_paragraph",
             params=self.params,
             inputs=inputs,
-            df=_rows_to_df(rows, fallback_df=df),
+            df=daft.from_arrow(_assign_column(table, output_col, paragraphs, pa.large_string())),
             output_uri=self.params.get("output_uri"),
             metadata={"source_uri": upstream.uri, "source_column": source_col, "output_column": output_col},
         )
@@ -841,8 +1153,9 @@ class ConversationToParagraphStage(DatasetStage):
 
 class ConcatenateColumnsStage(DatasetStage):
     def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
+        daft = _require_daft()
         df, upstream = _first_dataset_df(ctx, inputs, "ConcatenateColumnsStage")
-        rows = _rows_from_df(df)
+        table = _arrow_table(df)
         columns = self.params.get("columns")
         if isinstance(columns, str):
             columns = [item.strip() for item in columns.split(",") if item.strip()]
@@ -852,17 +1165,14 @@ class ConcatenateColumnsStage(DatasetStage):
         separator = str(self.params.get("separator", " "))
         output_column = str(self.params.get("output_column", "concatenated"))
 
-        for row in rows:
-            row[output_column] = separator.join(
-                _stringify(row.get(column)) for column in columns if _stringify(row.get(column))
-            )
+        concatenated = _join_non_empty([_non_empty_strings(table, str(column)) for column in columns], separator)
 
         return _materialize(
             ctx,
             stage_name="concatenate_columns",
             params=self.params,
             inputs=inputs,
-            df=_rows_to_df(rows, fallback_df=df),
+            df=daft.from_arrow(_assign_column(table, output_column, concatenated)),
             output_uri=self.params.get("output_uri"),
             metadata={"source_uri": upstream.uri, "columns": columns, "output_column": output_column},
         )
@@ -873,9 +1183,7 @@ class ConcatStage(DatasetStage):
         if len(inputs) >= 2:
             ordered_inputs = _multi_input(inputs, "ConcatStage")
             frames = [_read_lance(ctx, ref.uri) for _, ref in ordered_inputs]
-            merged = frames[0]
-            for frame in frames[1:]:
-                merged = merged.union_by_name(frame)
+            merged = _union_frames_by_name(frames, distinct=True)
             return _materialize(
                 ctx,
                 stage_name="concat",
@@ -900,26 +1208,26 @@ class ConcatStage(DatasetStage):
 
 class DuplicateSampleRatioStage(DatasetStage):
     def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
+        import numpy as np
+
+        daft = _require_daft()
         df, upstream = _first_dataset_df(ctx, inputs, "DuplicateSampleRatioStage")
-        rows = _rows_from_df(df)
+        table = _arrow_table(df)
         ratio = max(0.0, float(self.params.get("ratio", 2.0)))
         integer_part = int(ratio)
         remainder = ratio - integer_part
-        rng = random.Random(self.params.get("seed"))
 
-        duplicated: list[dict[str, Any]] = []
-        for row in rows:
-            for _ in range(integer_part):
-                duplicated.append(dict(row))
-            if remainder > 0 and rng.random() < remainder:
-                duplicated.append(dict(row))
+        copies = np.full(table.num_rows, integer_part, dtype=np.int64)
+        if remainder > 0:
+            copies += _numpy_rng(self.params.get("seed")).random(table.num_rows) < remainder
+        duplicated = table.take(np.repeat(np.arange(table.num_rows), copies))
 
         return _materialize(
             ctx,
             stage_name="duplicate_sample_ratio",
             params=self.params,
             inputs=inputs,
-            df=_rows_to_df(duplicated, fallback_df=df),
+            df=daft.from_arrow(duplicated),
             output_uri=self.params.get("output_uri"),
             metadata={"source_uri": upstream.uri, "ratio": ratio},
         )
@@ -927,72 +1235,101 @@ class DuplicateSampleRatioStage(DatasetStage):
 
 class SamplerStage(DatasetStage):
     def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
+        import numpy as np
+
+        daft = _require_daft()
         df, upstream = _first_dataset_df(ctx, inputs, "SamplerStage")
-        rows = _rows_from_df(df)
-        rng = random.Random(self.params.get("seed"))
+        table = _arrow_table(df)
+        rng = _numpy_rng(self.params.get("seed"))
         with_replacement = bool(self.params.get("with_replacement", False))
 
         sample_size = self.params.get("sample_size")
         if isinstance(sample_size, int):
             if with_replacement:
-                sampled = [dict(rng.choice(rows)) for _ in range(max(0, sample_size))] if rows else []
+                size = max(0, sample_size) if table.num_rows else 0
+                indices = rng.integers(0, max(1, table.num_rows), size=size)
             else:
-                sampled = rng.sample(rows, min(max(0, sample_size), len(rows)))
+                indices = rng.choice(table.num_rows, size=min(max(0, sample_size), table.num_rows), replace=False)
         else:
             fraction = min(1.0, max(0.0, float(self.params.get("fraction", 0.5))))
-            sampled = [row for row in rows if rng.random() <= fraction]
+            indices = np.flatnonzero(rng.random(table.num_rows) <= fraction)
+        sampled = table.take(indices)
 
         return _materialize(
             ctx,
             stage_name="sampler",
             params=self.params,
             inputs=inputs,
-            df=_rows_to_df(sampled, fallback_df=df),
+            df=daft.from_arrow(sampled),
             output_uri=self.params.get("output_uri"),
-            metadata={"source_uri": upstream.uri, "sampled_count": len(sampled)},
+            metadata={"source_uri": upstream.uri, "sampled_count": sampled.num_rows},
         )
 
 
 class FlattenStage(DatasetStage):
     def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
+        daft = _require_daft()
         df, upstream = _first_dataset_df(ctx, inputs, "FlattenStage")
-        rows = _rows_from_df(df)
         column = str(self.params.get("column", "items"))
         output_column = str(self.params.get("output_column", column))
         keep_empty = bool(self.params.get("keep_empty", False))
-
-        flattened: list[dict[str, Any]] = []
-        for row in rows:
-            value = row.get(column)
-            if isinstance(value, list):
-                if not value and keep_empty:
-                    copied = dict(row)
-                    copied[output_column] = None
-                    flattened.append(copied)
-                for element in value:
-                    copied = dict(row)
-                    copied[output_column] = element
-                    flattened.append(copied)
-            else:
-                copied = dict(row)
-                copied[output_column] = value
-                flattened.append(copied)
+        metadata = {"source_uri": upstream.uri, "column": column, "output_column": output_column}
+
+        dtype = _column_dtype(df, column)
+        if dtype is not None and (dtype.is_list() or dtype.is_fixed_size_list()):
+            flattened = df
+            if not keep_empty:
+                # explode() turns empty lists into a null row; only null values should survive as null.
+                flattened = flattened.where(daft.col(column).is_null() | (daft.functions.length(daft.col(column)) > 0))
+            if output_column != column:
+                flattened = flattened.with_column(output_column, daft.col(column))
+            flattened = flattened.explode(output_column)
+        else:
+            # Scalar values pass through unchanged, so the column is just copied under its output name.
+            source = daft.col(column) if dtype is not None else daft.lit(None)
+            flattened = df.with_column(output_column, source)
 
         return _materialize(
             ctx,
             stage_name="flatten",
             params=self.params,
             inputs=inputs,
-            df=_rows_to_df(flattened, fallback_df=df),
+            df=flattened,
             output_uri=self.params.get("output_uri"),
-            metadata={"source_uri": upstream.uri, "column": column, "output_column": output_column},
+            metadata=metadata,
         )
 
 
+def _group_ids(table: Any, columns: list[str]) -> tuple[Any, Any]:
+    """Dense group id per row, numbered by first appearance, plus the first row of each group."""
+    import numpy as np
+    import pyarrow.compute as pc
+
+    if not table.num_rows:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    codes = np.stack(
+        [
+            pc.dictionary_encode(table.column(column).combine_chunks(), null_encoding="encode")
+            .indices.to_numpy(zero_copy_only=False)
+            .astype(np.int64)
+            for column in columns
+        ],
+        axis=1,
+    )
+    _, first_rows, inverse = np.unique(codes, axis=0, return_index=True, return_inverse=True)
+    appearance = np.argsort(first_rows)
+    renumber = np.empty_like(appearance)
+    renumber[appearance] = np.arange(len(appearance))
+    return renumber[inverse.reshape(-1)], first_rows[appearance]
+
+
 class GroupFlattenStage(DatasetStage):
     def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
-        df, upstream = _first_dataset_df(ctx, inputs, "GroupFlattenStage")
-        rows = _rows_from_df(df)
+        import numpy as np
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        daft = _require_daft()
         group_by = self.params.get("group_by")
         if isinstance(group_by, str):
             group_columns = [item.strip() for item in group_by.split(",") if item.strip()]
@@ -1003,220 +1340,294 @@ class GroupFlattenStage(DatasetStage):
 
         flatten_column = str(self.params.get("flatten_column", "items"))
         output_column = str(self.params.get("output_column", flatten_column))
+        df, upstream = _first_dataset_df(ctx, inputs, "GroupFlattenStage", columns=[*group_columns, flatten_column])
+        table = _arrow_table(df)
+        group_ids, first_rows = _group_ids(table, group_columns)
+
+        # Flatten list cells into (element, parent row) pairs; scalar cells are their own single element.
+        if flatten_column not in table.column_names:
+            elements, parents = pa.array([], pa.null()), np.zeros(0, dtype=np.int64)
+        else:
+            values = table.column(flatten_column).combine_chunks()
+            if isinstance(values.type, (pa.ListType, pa.LargeListType, pa.FixedSizeListType)):
+                elements = pc.list_flatten(values)
+                parents = pc.list_parent_indices(values).to_numpy(zero_copy_only=False)
+            else:
+                valid = pc.is_valid(values)
+                elements = values.filter(valid)
+                parents = np.flatnonzero(valid.to_numpy(zero_copy_only=False))
+
+        # A stable sort by group keeps each group's elements in input order.
+        element_groups = group_ids[parents]
+        order = np.argsort(element_groups, kind="stable")
+        offsets = np.zeros(len(first_rows) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(element_groups, minlength=len(first_rows)), out=offsets[1:])
+        grouped = pa.LargeListArray.from_arrays(pa.array(offsets), elements.take(pa.array(order)))
 
-        grouped: dict[tuple[Any, ...], list[Any]] = {}
-        for row in rows:
-            key = tuple(row.get(column) for column in group_columns)
-            grouped.setdefault(key, [])
-            value = row.get(flatten_column)
-            if isinstance(value, list):
-                grouped[key].extend(value)
-            elif value is not None:
-                grouped[key].append(value)
-
-        flattened_rows: list[dict[str, Any]] = []
-        for key, values in grouped.items():
-            item = {column: value for column, value in zip(group_columns, key, strict=False)}
-            item[output_column] = values
-            flattened_rows.append(item)
+        flattened = _assign_column(table.select(group_columns).take(pa.array(first_rows)), output_column, grouped)
 
         return _materialize(
             ctx,
             stage_name="group_flatten",
             params=self.params,
             inputs=inputs,
-            df=_rows_to_df(flattened_rows, fallback_df=df),
+            df=daft.from_arrow(flattened),
             output_uri=self.params.get("output_uri"),
             metadata={"source_uri": upstream.uri, "group_by": group_columns, "output_column": output_column},
         )
 
 
-class FastTextScorerStage(DatasetStage):
-    def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
-        df, upstream = _first_dataset_df(ctx, inputs, "FastTextScorerStage")
-        rows = _rows_from_df(df)
+def _hash_scores(table: Any, column: str, algorithm: str, labels: list[Any]) -> tuple[Any, Any]:
+    """Score each text by the leading 32 bits of its digest and pick the matching label."""
+    import numpy as np
+    import pyarrow as pa
+
+    digest_prefixes = b"".join(
+        hashlib.new(algorithm, _stringify(value).encode("utf-8")).digest()[:4]
+        for value in _project_column(table, column)
+    )
+    raw_scores = np.frombuffer(digest_prefixes, dtype=">u4").astype(np.float64) / 0xFFFFFFFF
+    label_index = (raw_scores * len(labels)).astype(np.int64) % len(labels)
+    # Gather from the small label array in Arrow so no Python str is touched per row. Daft has no
+    # dictionary type (it would fall back to Python objects), so the labels are decoded to plain strings.
+    label_names = pa.array([str(label) for label in labels], pa.large_string())
+    scores = pa.array(np.round(raw_scores, 6), pa.float64())
+    return scores, label_names.take(pa.array(label_index))
+
+
+class FastTextScorerStage(FrameTransformStage):
+    stage_name = "fasttext_scorer"
+
+    def _labels(self) -> list[Any]:
+        labels = self.params.get("labels")
+        if not isinstance(labels, list) or not labels:
+            return ["negative", "positive"]
+        return labels
+
+    def transform(self, ctx: DatasetRuntimeContext, df: Any) -> Any:
+        daft = _require_daft()
+        table = _arrow_table(df)
         text_column = str(self.params.get("text_column", "text"))
         score_column = str(self.params.get("score_column", "fasttext_score"))
         label_column = str(self.params.get("label_column", "fasttext_label"))
-        labels = self.params.get("labels")
-        if not isinstance(labels, list) or not labels:
-            labels = ["negative", "positive"]
 
-        for row in rows:
-            text = _stringify(row.get(text_column))
-            digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
-            score = int(digest[:8], 16) / 0xFFFFFFFF
-            row[score_column] = round(score, 6)
-            row[label_column] = str(labels[int(score * len(labels)) % len(labels)])
+        scores, predicted = _hash_scores(table, text_column, "sha256", self._labels())
+        table = _assign_column(table, score_column, scores)
+        table = _assign_column(table, label_column, predicted)
+        return daft.from_arrow(table)
 
-        return _materialize(
-            ctx,
-            stage_name="fasttext_scorer",
-            params=self.params,
-            inputs=inputs,
-            df=_rows_to_df(rows, fallback_df=df),
-            output_uri=self.params.get("output_uri"),
-            metadata={"source_uri": upstream.uri, "text_column": text_column, "labels": labels},
-        )
+    def output_metadata(self) -> dict[str, Any]:
+        return {"text_column": str(self.params.get("text_column", "text")), "labels": self._labels()}
 
 
-class FastTextFilterStage(DatasetStage):
-    def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
-        df, upstream = _first_dataset_df(ctx, inputs, "FastTextFilterStage")
-        rows = _rows_from_df(df)
+class FastTextFilterStage(FrameTransformStage):
+    stage_name = "fasttext_filter"
+
+    def transform(self, ctx: DatasetRuntimeContext, df: Any) -> Any:
+        daft = _require_daft()
         score_column = str(self.params.get("score_column", "fasttext_score"))
         min_score = float(self.params.get("min_score", 0.5))
         max_score = float(self.params.get("max_score", 1.0))
-        filtered = [
-            row
-            for row in rows
-            if isinstance(row.get(score_column), (int, float))
-            and min_score <= float(row.get(score_column)) <= max_score
-        ]
-        return _materialize(
-            ctx,
-            stage_name="fasttext_filter",
-            params=self.params,
-            inputs=inputs,
-            df=_rows_to_df(filtered, fallback_df=df),
-            output_uri=self.params.get("output_uri"),
-            metadata={
-                "source_uri": upstream.uri,
-                "score_column": score_column,
-                "min_score": min_score,
-                "max_score": max_score,
-            },
-        )
+
+        dtype = _column_dtype(df, score_column)
+        if dtype is None or not (dtype.is_numeric() or dtype.is_boolean()):
+            # Only numeric scores can pass the range check.
+            return df.limit(0)
+        score = daft.col(score_column).cast(daft.DataType.float64())
+        return df.where((score >= min_score) & (score <= max_score))
+
+    def output_metadata(self) -> dict[str, Any]:
+        return {
+            "score_column": str(self.params.get("score_column", "fasttext_score")),
+            "min_score": float(self.params.get("min_score", 0.5)),
+            "max_score": float(self.params.get("max_score", 1.0)),
+        }
 
 
 class SeqClassifierScorerStage(DatasetStage):
     def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
+        daft = _require_daft()
         df, upstream = _first_dataset_df(ctx, inputs, "SeqClassifierScorerStage")
-        rows = _rows_from_df(df)
+        table = _arrow_table(df)
         text_column = str(self.params.get("text_column", "text"))
         output_prefix = str(self.params.get("output_prefix", "seq_classifier"))
         labels = self.params.get("labels")
         if not isinstance(labels, list) or not labels:
             labels = ["label_a", "label_b", "label_c"]
 
-        for row in rows:
-            text = _stringify(row.get(text_column))
-            digest = hashlib.md5(text.encode("utf-8")).hexdigest()  # noqa: S324
-            score = int(digest[:8], 16) / 0xFFFFFFFF
-            label = str(labels[int(score * len(labels)) % len(labels)])
-            row[f"{output_prefix}_label"] = label
-            row[f"{output_prefix}_score"] = round(score, 6)
+        scores, predicted = _hash_scores(table, text_column, "md5", labels)
+        table = _assign_column(table, f"{output_prefix}_label", predicted)
+        table = _assign_column(table, f"{output_prefix}_score", scores)
 
         return _materialize(
             ctx,
             stage_name="seq_classifier_scorer",
             params=self.params,
             inputs=inputs,
-            df=_rows_to_df(rows, fallback_df=df),
+            df=daft.from_arrow(table),
             output_uri=self.params.get("output_uri"),
             metadata={"source_uri": upstream.uri, "labels": labels, "text_column": text_column},
         )
 
 
+def _first_occurrence_indices(column: Any) -> Any:
+    """Row indices of the first occurrence of each distinct value, in original order."""
+    import numpy as np
+    import pyarrow as pa
+
+    keyed = pa.table({"key": column, "row": pa.array(np.arange(len(column), dtype=np.int64))})
+    firsts = keyed.group_by("key", use_threads=False).aggregate([("row", "min")]).column("row_min")
+    return pa.array(np.sort(firsts.to_numpy()))
+
+
+# Mersenne prime 2**31 - 1 keeps a * hash + b below 2**63, so the permutations never overflow uint64.
+_MINHASH_PRIME = (1 << 31) - 1
+
+
+@lru_cache(maxsize=32)
+def _minhash_permutations(num_hashes: int) -> tuple[Any, Any]:
+    import numpy as np
+
+    rng = np.random.default_rng(num_hashes)
+    multipliers = rng.integers(1, _MINHASH_PRIME, size=(num_hashes, 1), dtype=np.uint64)
+    offsets = rng.integers(0, _MINHASH_PRIME, size=(num_hashes, 1), dtype=np.uint64)
+    return multipliers, offsets
+
+
 class MinHashStage(DatasetStage):
     _TOKEN_RE = re.compile(r"[A-Za-z0-9_]+")
 
-    def _signature(self, text: str, num_hashes: int, shingle_size: int) -> str:
+    def _shingles(self, text: str, shingle_size: int) -> set[str]:
         tokens = self._TOKEN_RE.findall(text.lower())
-        if not tokens:
-            return ",".join(["0"] * num_hashes)
-
-        shingles: set[str] = set()
         if len(tokens) < shingle_size:
-            shingles.add(" ".join(tokens))
-        else:
-            for idx in range(len(tokens) - shingle_size + 1):
-                shingles.add(" ".join(tokens[idx : idx + shingle_size]))
+            return {" ".join(tokens)} if tokens else set()
+        return {" ".join(tokens[idx : idx + shingle_size]) for idx in range(len(tokens) - shingle_size + 1)}
+
+    def _signatures(self, texts: list[str], num_hashes: int, shingle_size: int) -> list[str]:
+        import numpy as np
+
+        # Lay every shingle of the batch out in one flat CSR array so the permutations and
+        # per-row minimums run as a handful of NumPy calls instead of one set per row.
+        row_shingles = [self._shingles(text, shingle_size) for text in texts]
+        counts = np.fromiter((len(shingles) for shingles in row_shingles), dtype=np.int64, count=len(texts))
+        digests = b"".join(
+            hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+            for shingles in row_shingles
+            for shingle in shingles
+        )
+        base = np.frombuffer(digests, dtype="<u8") % _MINHASH_PRIME
+        multipliers, offsets = _minhash_permutations(num_hashes)
 
-        mins: list[int] = []
-        for seed in range(num_hashes):
-            values = [
-                int(hashlib.sha1(f"{seed}:{shingle}".encode("utf-8")).hexdigest()[:12], 16) for shingle in shingles
-            ]
-            mins.append(min(values))
-        return ",".join(str(item) for item in mins)
+        mins = np.zeros((len(texts), num_hashes), dtype=np.uint64)
+        has_shingles = counts > 0
+        if has_shingles.any():
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[has_shingles]
+            permuted = (multipliers * base + offsets) % _MINHASH_PRIME
+            mins[has_shingles] = np.minimum.reduceat(permuted, starts, axis=1).T
+        return [",".join(map(str, row)) for row in mins.tolist()]
 
     def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
+        import pyarrow as pa
+
+        daft = _require_daft()
         df, upstream = _first_dataset_df(ctx, inputs, "MinHashStage")
-        rows = _rows_from_df(df)
         text_column = str(self.params.get("text_column", "text"))
         output_column = str(self.params.get("output_column", "minhash"))
         num_hashes = max(1, int(self.params.get("num_hashes", 16)))
         shingle_size = max(1, int(self.params.get("shingle_size", 3)))
         deduplicate = bool(self.params.get("deduplicate", False))
 
-        seen: set[str] = set()
-        transformed: list[dict[str, Any]] = []
-        for row in rows:
-            text = _stringify(row.get(text_column))
-            signature = self._signature(text, num_hashes=num_hashes, shingle_size=shingle_size)
-            row[output_column] = signature
-            if deduplicate and signature in seen:
-                continue
-            seen.add(signature)
-            transformed.append(row)
+        # Work one Arrow batch at a time: only the text column is converted to Python strings.
+        transformed: list[Any] = []
+        for batch in _iter_arrow_batches(df, batch_size=1024):
+            table = pa.Table.from_batches([batch])
+            texts = [_stringify(value) for value in _project_column(table, text_column)]
+            signatures = self._signatures(texts, num_hashes=num_hashes, shingle_size=shingle_size)
+            transformed.append(_assign_column(table, output_column, signatures, pa.large_string()))
+
+        if transformed:
+            signed = pa.concat_tables(transformed)
+            if deduplicate:
+                signed = signed.take(_first_occurrence_indices(signed.column(output_column)))
+            minhashed = daft.from_arrow(signed)
+        else:
+            minhashed = _rows_to_df([], fallback_df=df)
 
         return _materialize(
             ctx,
             stage_name="minhash",
             params=self.params,
             inputs=inputs,
-            df=_rows_to_df(transformed, fallback_df=df),
+            df=minhashed,
             output_uri=self.params.get("output_uri"),
             metadata={"source_uri": upstream.uri, "deduplicate": deduplicate, "output_column": output_column},
         )
 
 
-class AddRankQuantileStage(DatasetStage):
-    def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
-        df, upstream = _first_dataset_df(ctx, inputs, "AddRankQuantileStage")
-        rows = _rows_from_df(df)
+class AddRankQuantileStage(FrameTransformStage):
+    stage_name = "add_rank_quantile"
+
+    def transform(self, ctx: DatasetRuntimeContext, df: Any) -> Any:
+        import numpy as np
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        daft = _require_daft()
+        table = _arrow_table(df)
         score_column = str(self.params.get("score_column", "fasttext_score"))
         rank_column = str(self.params.get("rank_column", "rank"))
         quantile_column = str(self.params.get("quantile_column", "quantile"))
         quantiles = max(1, int(self.params.get("quantiles", 4)))
 
-        ordered = sorted(rows, key=lambda row: float(row.get(score_column) or 0.0), reverse=True)
-        total = max(1, len(ordered))
-        for idx, row in enumerate(ordered, start=1):
-            row[rank_column] = idx
-            row[quantile_column] = min(quantiles, int(((idx - 1) / total) * quantiles) + 1)
-
-        return _materialize(
-            ctx,
-            stage_name="add_rank_quantile",
-            params=self.params,
-            inputs=inputs,
-            df=_rows_to_df(ordered, fallback_df=df),
-            output_uri=self.params.get("output_uri"),
-            metadata={"source_uri": upstream.uri, "score_column": score_column, "quantiles": quantiles},
-        )
+        score_type = table.schema.field(score_column).type if score_column in table.column_names else None
+        if score_type is not None and (pa.types.is_floating(score_type) or pa.types.is_integer(score_type)):
+            scores = pc.fill_null(pc.cast(table.column(score_column), pa.float64()), 0.0)
+        else:
+            scores = pa.array([float(value or 0.0) for value in _project_column(table, score_column)], pa.float64())
+        # sort_indices is stable, matching sorted(..., reverse=True) on ties.
+        ordered = table.take(pc.sort_indices(scores, sort_keys=[("", "descending")]))
+        ranks = np.arange(1, ordered.num_rows + 1, dtype=np.int64)
+        total = max(1, ordered.num_rows)
+        # Integer bucketing avoids float rounding at bucket edges.
+        quantile_values = np.minimum(quantiles, (ranks - 1) * quantiles // total + 1)
+        ordered = _assign_column(ordered, rank_column, pa.array(ranks))
+        ordered = _assign_column(ordered, quantile_column, pa.array(quantile_values))
+        return daft.from_arrow(ordered)
+
+    def output_metadata(self) -> dict[str, Any]:
+        return {
+            "score_column": str(self.params.get("score_column", "fasttext_score")),
+            "quantiles": max(1, int(self.params.get("quantiles", 4))),
+        }
 
 
 class TokenCounterV2Stage(DatasetStage):
     _TOKEN_RE = re.compile(r"[A-Za-z0-9_]+")
 
     def run(self, ctx: DatasetRuntimeContext, inputs: dict[str, DatasetRef]) -> DatasetRef:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        daft = _require_daft()
         df, upstream = _first_dataset_df(ctx, inputs, "TokenCounterV2Stage")
-        rows = _rows_from_df(df)
         text_column = str(self.params.get("text_column", "text"))
         output_column = str(self.params.get("output_column", "token_count_v2"))
 
-        for row in rows:
-            tokens = self._TOKEN_RE.findall(_stringify(row.get(text_column)))
-            row[output_column] = len(tokens)
+        table = _arrow_table(df)
+        if text_column in table.column_names and _is_arrow_string(table.schema.field(text_column).type):
+            # Count regex matches straight over the string buffers; no per-row token lists are built.
+            matches = pc.count_substring_regex(table.column(text_column), self._TOKEN_RE.pattern)
+            counts = pc.cast(pc.fill_null(matches, 0), pa.int64())
+        else:
+            counts = [len(self._TOKEN_RE.findall(_stringify(value))) for value in _project_column(table, text_column)]
+        counted = daft.from_arrow(_assign_column(table, output_column, counts, pa.int64()))
 
         return _materialize(
             ctx,
             stage_name="token_counter_v2",
             params=self.params,
             inputs=inputs,
-            df=_rows_to_df(rows, fallback_df=df),
+            df=counted,
             output_uri=self.params.get("output_uri"),
             metadata={"source_uri": upstream.uri, "text_column": text_column, "output_column": output_column},
         )
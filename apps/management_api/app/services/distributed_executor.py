@@ -13,45 +13,21 @@ from __future__ import annotations
 
 import logging
 import time
-from collections import deque
 from typing import Any, Callable
 
 from app.schemas.pipeline_spec import PipelineSpecDocument, StageDefinition
-from app.services.dataset_executor import DatasetPipelineResult, _build_context, _maybe_init_ray_and_daft
+from app.services.dataset_executor import (
+    DatasetPipelineResult,
+    _build_context,
+    _maybe_init_ray_and_daft,
+    _topological_order,
+)
 from app.services.dataset_types import DatasetRef, DatasetStage
 from app.services.xenna_adapter import DatasetStageAdapter, is_xenna_available
 
 logger = logging.getLogger(__name__)
 
 
-def _topological_order(spec: PipelineSpecDocument) -> tuple[list[str], dict[str, list[str]], dict[str, list[str]]]:
-    """Compute topological execution order of pipeline stages."""
-    stage_ids = [stage.stage_id for stage in spec.stages]
-    incoming: dict[str, list[str]] = {sid: [] for sid in stage_ids}
-    adjacency: dict[str, list[str]] = {sid: [] for sid in stage_ids}
-    indegree = {sid: 0 for sid in stage_ids}
-
-    for edge in spec.edges:
-        adjacency[edge.source].append(edge.target)
-        incoming[edge.target].append(edge.source)
-        indegree[edge.target] += 1
-
-    queue = deque([sid for sid in stage_ids if indegree[sid] == 0])
-    order: list[str] = []
-    local_indegree = indegree.copy()
-    while queue:
-        node = queue.popleft()
-        order.append(node)
-        for nxt in adjacency[node]:
-            local_indegree[nxt] -= 1
-            if local_indegree[nxt] == 0:
-                queue.append(nxt)
-
-    if len(order) != len(stage_ids):
-        raise ValueError("Dataset pipeline graph is not acyclic")
-    return order, adjacency, incoming
-
-
 def _instantiate_dataset_stage(stage: StageDefinition) -> DatasetStage:
     """Instantiate a DatasetStage from a StageDefinition."""
     from app.services.stage_registry import get_template_class
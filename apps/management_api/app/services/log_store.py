@@ -1,25 +1,90 @@
 from __future__ import annotations
 
 import threading
-from collections import defaultdict, deque
+from collections import deque
+from itertools import islice
+
+_LOCK_STRIPES = 64
 
 
 class RunLogStore:
     def __init__(self, max_lines: int = 2000) -> None:
-        self._lock = threading.Lock()
+        # Runs only contend with runs hashed onto the same stripe, not with every other run.
+        self._locks = [threading.Lock() for _ in range(_LOCK_STRIPES)]
         self._max_lines = max_lines
-        self._logs: dict[str, deque[str]] = defaultdict(lambda: deque(maxlen=self._max_lines))
+        self._logs: dict[str, deque[str]] = {}
+
+    def _lock_for(self, run_id: str) -> threading.Lock:
+        return self._locks[hash(run_id) % _LOCK_STRIPES]
 
     def append(self, run_id: str, line: str) -> None:
-        with self._lock:
-            self._logs[run_id].append(line)
+        with self._lock_for(run_id):
+            lines = self._logs.get(run_id)
+            if lines is None:
+                lines = self._logs.setdefault(run_id, deque(maxlen=self._max_lines))
+            lines.append(line)
+
+    def append_many(self, run_id: str, new_lines: list[str]) -> None:
+        if not new_lines:
+            return
+        with self._lock_for(run_id):
+            lines = self._logs.get(run_id)
+            if lines is None:
+                lines = self._logs.setdefault(run_id, deque(maxlen=self._max_lines))
+            lines.extend(new_lines)
+
+    def line_count(self, run_id: str) -> int:
+        with self._lock_for(run_id):
+            lines = self._logs.get(run_id)
+            return len(lines) if lines is not None else 0
 
     def get_since(self, run_id: str, cursor: int) -> tuple[list[str], int]:
+        with self._lock_for(run_id):
+            lines = self._logs.get(run_id)
+            total = len(lines) if lines is not None else 0
+            if cursor >= total:
+                return [], total
+            # Copy only the unread tail instead of the whole buffer.
+            return list(islice(lines, max(cursor, 0), total)), total
+
+
+class RunLogBuffer:
+    """Collects one run's log lines and hands them to a store in batches.
+
+    A batch is flushed once it reaches ``flush_size`` lines or ``flush_interval`` seconds after its
+    first line, whichever comes first, so readers see lines with at most that much delay.
+    """
+
+    def __init__(self, store: RunLogStore, run_id: str, flush_size: int = 64, flush_interval: float = 0.05) -> None:
+        self._store = store
+        self._run_id = run_id
+        self._flush_size = flush_size
+        self._flush_interval = flush_interval
+        self._lines: list[str] = []
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+
+    def append(self, line: str) -> None:
         with self._lock:
-            lines = list(self._logs.get(run_id, deque()))
-        if cursor >= len(lines):
-            return [], len(lines)
-        return lines[cursor:], len(lines)
+            self._lines.append(line)
+            if len(self._lines) >= self._flush_size:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self._flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._lines:
+            self._store.append_many(self._run_id, self._lines)
+            self._lines = []
 
 
 run_log_store = RunLogStore()
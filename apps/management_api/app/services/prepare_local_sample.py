@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 import hashlib
+import json
 import logging
+import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -10,6 +14,11 @@ logger = logging.getLogger(__name__)
 
 _ARTIFACT_ROOT = Path("/tmp/pipelineforge_artifacts")
 _DATAFINER_SAMPLE_PATH = _ARTIFACT_ROOT / "datafiner_input.lance"
+_MANIFEST_PATH = _ARTIFACT_ROOT / "sample_manifest.json"
+
+# Bump when the generators change in a way the spec tables below do not capture, so
+# existing artifacts are regenerated instead of reused.
+_GENERATOR_VERSION = 1
 
 # ---------------------------------------------------------------------------
 # Corpus layout — each source gets its own Lance file
@@ -264,82 +273,177 @@ _FIELDS = [
 ]
 
 
-def _deterministic_int(idx: int, salt: str) -> int:
-    return int(hashlib.sha256(f"{idx}:{salt}".encode("utf-8")).hexdigest()[:8], 16)
-
-
-def _pick_domain(idx: int, source: str) -> str:
-    domains = _SOURCE_DOMAINS[source]
-    return domains[_deterministic_int(idx, "domain") % len(domains)]
-
-
-def _generate_text(idx: int, domain: str) -> str:
-    templates = _DOMAIN_TEMPLATES[domain]
-    template_idx = _deterministic_int(idx, "template") % len(templates)
-    template = templates[template_idx]
-
-    topic_a = _TOPICS_A[_deterministic_int(idx, "topic_a") % len(_TOPICS_A)]
-    topic_b = _TOPICS_B[_deterministic_int(idx, "topic_b") % len(_TOPICS_B)]
-    field = _FIELDS[_deterministic_int(idx, "field") % len(_FIELDS)]
+# Integer-indexed views of the tables above, so per-row lookups are plain tuple/array indexing.
+_DOMAIN_NAMES: tuple[str, ...] = tuple(_DOMAIN_TEMPLATES)
+_DOMAIN_IDS: dict[str, int] = {domain: domain_id for domain_id, domain in enumerate(_DOMAIN_NAMES)}
+_SOURCE_DOMAIN_IDS: dict[str, tuple[int, ...]] = {
+    source: tuple(_DOMAIN_IDS[domain] for domain in domains) for source, domains in _SOURCE_DOMAINS.items()
+}
+_TEMPLATES_FLAT: tuple[str, ...] = tuple(template for domain in _DOMAIN_NAMES for template in _DOMAIN_TEMPLATES[domain])
+_TEMPLATE_COUNTS: tuple[int, ...] = tuple(len(_DOMAIN_TEMPLATES[domain]) for domain in _DOMAIN_NAMES)
+_TEMPLATE_OFFSETS: tuple[int, ...] = tuple(sum(_TEMPLATE_COUNTS[:domain_id]) for domain_id in range(len(_DOMAIN_NAMES)))
+
+_SOURCE_IDS: tuple[str, ...] = ("src-0", "src-1", "src-2")
+_ASSISTANT_REPLY = "Acknowledged and processed."
+
+
+def _deterministic_ints(indices: Any, salt: str) -> Any:
+    """Return a deterministic 32-bit draw per row id for the given salt.
+
+    The salt is hashed once; each id is then scrambled with the splitmix64 finaliser in NumPy.
+    Draws depend only on (id, salt), so any row can be regenerated on its own.
+    """
+    import numpy as np
+
+    key = np.uint64(int.from_bytes(hashlib.blake2b(salt.encode("utf-8"), digest_size=8).digest(), "big"))
+    mixed = indices.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15) + key
+    mixed = (mixed ^ (mixed >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    mixed = (mixed ^ (mixed >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    mixed ^= mixed >> np.uint64(31)
+    return (mixed >> np.uint64(32)).astype(np.int64)
+
+
+def _pick_domain_ids(indices: Any, source: str) -> Any:
+    import numpy as np
+
+    domain_ids = np.asarray(_SOURCE_DOMAIN_IDS[source], dtype=np.int64)
+    return domain_ids[_deterministic_ints(indices, "domain") % len(domain_ids)]
+
+
+def _generate_texts(indices: Any, domain_ids: Any) -> list[str]:
+    import numpy as np
+
+    offsets = np.asarray(_TEMPLATE_OFFSETS, dtype=np.int64)[domain_ids]
+    counts = np.asarray(_TEMPLATE_COUNTS, dtype=np.int64)[domain_ids]
+    template_ids = (offsets + _deterministic_ints(indices, "template") % counts).tolist()
+    topic_a_draws = (_deterministic_ints(indices, "topic_a") % len(_TOPICS_A)).tolist()
+    topic_b_draws = (_deterministic_ints(indices, "topic_b") % len(_TOPICS_B)).tolist()
+    field_draws = (_deterministic_ints(indices, "field") % len(_FIELDS)).tolist()
+    repeat_counts = (_deterministic_ints(indices, "repeat") % 4).tolist()
+    suffix_draws = [(_deterministic_ints(indices, f"suffix_{r}") % 4).tolist() for r in range(3)]
+
+    texts: list[str] = []
+    for row, template_id in enumerate(template_ids):
+        topic_a = _TOPICS_A[topic_a_draws[row]]
+        topic_b = _TOPICS_B[topic_b_draws[row]]
+        field = _FIELDS[field_draws[row]]
+        text = _TEMPLATES_FLAT[template_id].format(topic_a=topic_a, topic_b=topic_b, field=field)
+
+        # Extend shorter texts by repeating with variation to reach 30-300 word range
+        repeat_count = repeat_counts[row]
+        if repeat_count > 0:
+            suffixes = [
+                f"Further analysis in the {field} context confirms these observations.",
+                f"Additional {topic_a} measurements support the {topic_b} hypothesis.",
+                f"The {field} community has noted the significance of these findings.",
+                f"Subsequent {topic_a} experiments yielded consistent {topic_b} results.",
+            ]
+            for r in range(repeat_count):
+                text += " " + suffixes[suffix_draws[r][row]]
+        texts.append(text)
+    return texts
+
+
+@lru_cache(maxsize=1)
+def _corpus_schema() -> Any:
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("id", pa.int64()),
+            ("source_id", pa.string()),
+            ("source", pa.string()),
+            ("domain", pa.string()),
+            ("language", pa.string()),
+            ("score", pa.float64()),
+            ("text", pa.string()),
+            ("question", pa.string()),
+            ("items", pa.list_(pa.string())),
+            ("conversation", pa.list_(pa.struct([("role", pa.string()), ("content", pa.string())]))),
+            ("category", pa.string()),
+            ("url", pa.string()),
+        ]
+    )
 
-    text = template.format(topic_a=topic_a, topic_b=topic_b, field=field)
 
-    # Extend shorter texts by repeating with variation to reach 30-300 word range
-    repeat_count = _deterministic_int(idx, "repeat") % 4
-    if repeat_count > 0:
-        suffixes = [
-            f"Further analysis in the {field} context confirms these observations.",
-            f"Additional {topic_a} measurements support the {topic_b} hypothesis.",
-            f"The {field} community has noted the significance of these findings.",
-            f"Subsequent {topic_a} experiments yielded consistent {topic_b} results.",
+@lru_cache(maxsize=1)
+def _video_catalog_schema() -> Any:
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("video_id", pa.string()),
+            ("source_uri", pa.string()),
+            ("duration_seconds", pa.float64()),
+            ("resolution_width", pa.int64()),
+            ("resolution_height", pa.int64()),
+            ("fps", pa.float64()),
+            ("codec", pa.string()),
+            ("pixel_format", pa.string()),
+            ("file_size_bytes", pa.int64()),
+            ("category", pa.string()),
+            ("upload_date", pa.string()),
         ]
-        for r in range(repeat_count):
-            text += " " + suffixes[_deterministic_int(idx, f"suffix_{r}") % len(suffixes)]
+    )
 
-    return text
 
+def _build_corpus_table(source: str, count: int, global_offset: int) -> Any:
+    """Generate *count* rows for a single corpus source as an Arrow table, one column at a time."""
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
 
-def _build_corpus_rows(source: str, count: int, global_offset: int) -> list[dict[str, Any]]:
-    """Generate *count* rows for a single corpus source."""
-    rows: list[dict[str, Any]] = []
     language = "zh" if source == "fineweb-edu-zh" else "en"
+    ids = np.arange(global_offset, global_offset + count, dtype=np.int64)
     # ~5% near-duplicates within each corpus: first 5% of rows copy from the
     # corresponding row one corpus-length ahead in the global ID space, with a
     # small suffix so MinHash dedup has real work.
     dup_boundary = int(count * 0.05)
 
-    for local_idx in range(count):
-        idx = global_offset + local_idx  # globally unique row id
-        domain = _pick_domain(idx, source)
-        score = round(_deterministic_int(idx, "score") / 0xFFFFFFFF, 6)
-
-        if local_idx < dup_boundary:
-            donor_idx = global_offset + dup_boundary + local_idx
-            donor_domain = _pick_domain(donor_idx, source)
-            text = _generate_text(donor_idx, donor_domain) + f" [dup-{idx}]"
-        else:
-            text = _generate_text(idx, domain)
-
-        rows.append(
-            {
-                "id": idx,
-                "source_id": f"src-{idx % 3}",
-                "source": source,
-                "domain": domain,
-                "language": language,
-                "score": score,
-                "text": text,
-                "question": f"What is the expected behavior for sample {idx}?",
-                "items": [f"item-{idx}", f"item-{idx + 1}"],
-                "conversation": [
-                    {"role": "user", "content": f"Hello from row {idx}."},
-                    {"role": "assistant", "content": "Acknowledged and processed."},
-                ],
-                "category": "train" if idx % 2 == 0 else "eval",
-                "url": f"https://corpus.example.com/{source}/{domain}/{idx}",
-            }
-        )
-    return rows
+    domain_ids = _pick_domain_ids(ids, source)
+    domains = pa.array(_DOMAIN_NAMES).take(pa.array(domain_ids))
+    id_strings = pc.cast(pa.array(ids), pa.string())
+    # Donor rows all sit past the duplicate band, so their texts are generated once and reused.
+    unique_texts = pa.array(_generate_texts(ids[dup_boundary:], domain_ids[dup_boundary:]), pa.string())
+    dup_texts = pc.binary_join_element_wise(
+        unique_texts.slice(0, dup_boundary), " [dup-", id_strings.slice(0, dup_boundary), "]", ""
+    )
+    texts = pa.concat_arrays([dup_texts, unique_texts])
+
+    # Row i lists item-{id} and item-{id + 1}, i.e. entries i and i + 1 of one extended item range.
+    item_range = np.arange(global_offset, global_offset + count + 1, dtype=np.int64)
+    item_names = pc.binary_join_element_wise("item-", pc.cast(pa.array(item_range), pa.string()), "")
+    item_positions = np.repeat(np.arange(count + 1, dtype=np.int64), 2)[1:-1]
+    pair_offsets = pa.array(np.arange(0, 2 * count + 1, 2, dtype=np.int32))
+    items = pa.ListArray.from_arrays(pair_offsets, item_names.take(pa.array(item_positions)))
+    # Each conversation is the row's user greeting followed by the shared assistant reply.
+    greetings = pc.binary_join_element_wise("Hello from row ", id_strings, ".", "")
+    turn_positions = np.stack([np.arange(count), np.full(count, count)], axis=1).ravel()
+    turns = pa.StructArray.from_arrays(
+        [
+            pa.array(["user", "assistant"]).take(pa.array(np.tile([0, 1], count))),
+            pa.concat_arrays([greetings, pa.array([_ASSISTANT_REPLY])]).take(pa.array(turn_positions)),
+        ],
+        names=["role", "content"],
+    )
+    conversation = pa.ListArray.from_arrays(pair_offsets, turns)
+    return pa.table(
+        {
+            "id": ids,
+            "source_id": pa.array(_SOURCE_IDS).take(pa.array(ids % 3)),
+            "source": pa.repeat(source, count),
+            "domain": domains,
+            "language": pa.repeat(language, count),
+            "score": np.round(_deterministic_ints(ids, "score") / 0xFFFFFFFF, 6),
+            "text": texts,
+            "question": pc.binary_join_element_wise("What is the expected behavior for sample ", id_strings, "?", ""),
+            "items": items,
+            "conversation": conversation,
+            "category": pc.if_else(pa.array(ids % 2 == 0), "train", "eval"),
+            "url": pc.binary_join_element_wise(f"https://corpus.example.com/{source}/", domains, "/", id_strings, ""),
+        },
+        schema=_corpus_schema(),
+    )
 
 
 _RESOLUTIONS = [(640, 360), (1280, 720), (1920, 1080), (3840, 2160)]
@@ -349,16 +453,24 @@ _CODEC_OPTIONS = ["h264", "hevc", "av1"]
 
 def _build_video_catalog_rows(source: str, count: int, global_offset: int) -> list[dict[str, Any]]:
     """Generate *count* video catalog rows for a single source."""
+    import numpy as np
+
+    ids = np.arange(global_offset, global_offset + count, dtype=np.int64)
+    resolution_draws = (_deterministic_ints(ids, "resolution") % len(_RESOLUTIONS)).tolist()
+    fps_draws = (_deterministic_ints(ids, "fps") % len(_FPS_OPTIONS)).tolist()
+    codec_draws = (_deterministic_ints(ids, "codec") % len(_CODEC_OPTIONS)).tolist()
+    duration_draws = (_deterministic_ints(ids, "duration") % 29500).tolist()
+    day_offsets = (_deterministic_ints(ids, "date") % 730).tolist()
+
     rows: list[dict[str, Any]] = []
-    for local_idx in range(count):
-        idx = global_offset + local_idx
-        res_w, res_h = _RESOLUTIONS[_deterministic_int(idx, "resolution") % len(_RESOLUTIONS)]
-        fps = _FPS_OPTIONS[_deterministic_int(idx, "fps") % len(_FPS_OPTIONS)]
-        codec = _CODEC_OPTIONS[_deterministic_int(idx, "codec") % len(_CODEC_OPTIONS)]
-        duration = round(5.0 + (_deterministic_int(idx, "duration") % 29500) / 100.0, 2)
+    for row, idx in enumerate(ids.tolist()):
+        res_w, res_h = _RESOLUTIONS[resolution_draws[row]]
+        fps = _FPS_OPTIONS[fps_draws[row]]
+        codec = _CODEC_OPTIONS[codec_draws[row]]
+        duration = round(5.0 + duration_draws[row] / 100.0, 2)
         bitrate = 2_500_000 if res_w <= 1280 else 8_000_000
         file_size = int(duration * bitrate / 8)
-        day_offset = _deterministic_int(idx, "date") % 730
+        day_offset = day_offsets[row]
         upload_date = f"2024-{(day_offset // 30) % 12 + 1:02d}-{day_offset % 28 + 1:02d}"
 
         rows.append(
@@ -379,15 +491,17 @@ def _build_video_catalog_rows(source: str, count: int, global_offset: int) -> li
     return rows
 
 
-def _sample_rows() -> list[dict[str, Any]]:
+def _sample_table() -> Any:
     """Return all 100,000 rows across every corpus (used for the combined
     backward-compatible Lance file consumed by the 10 existing templates)."""
-    all_rows: list[dict[str, Any]] = []
+    import pyarrow as pa
+
+    tables = []
     offset = 0
     for source, count in _CORPUS_SPECS:
-        all_rows.extend(_build_corpus_rows(source, count, offset))
+        tables.append(_build_corpus_table(source, count, offset))
         offset += count
-    return all_rows
+    return pa.concat_tables(tables)
 
 
 def _wipe_path(path: Path) -> None:
@@ -398,65 +512,140 @@ def _wipe_path(path: Path) -> None:
             path.unlink()
 
 
+def _write_lance(table: Any, path: Path, mode: str = "overwrite") -> None:
+    import lance  # type: ignore
+
+    # The tables are already Arrow, so hand them to Lance directly instead of planning a Daft write.
+    lance.write_dataset(table, str(path), mode=mode)
+
+
+def _combine_lance_datasets(source_paths: list[Path], path: Path) -> int:
+    """Commit a Lance dataset at *path* made of the fragments of *source_paths*, in order.
+
+    Lance data files are immutable, so they are hard-linked (copied across devices) into the new
+    dataset instead of decoding and re-encoding every row. Returns the combined row count.
+    """
+    import dataclasses
+
+    import lance  # type: ignore
+
+    data_dir = path / "data"
+    data_dir.mkdir(parents=True)
+    schema = None
+    fragments: list[Any] = []
+    for source_path in source_paths:
+        dataset = lance.dataset(str(source_path))
+        schema = schema or dataset.schema
+        for fragment in dataset.get_fragments():
+            metadata = fragment.metadata
+            for data_file in metadata.files:
+                try:
+                    os.link(source_path / "data" / data_file.path, data_dir / data_file.path)
+                except OSError:
+                    shutil.copy2(source_path / "data" / data_file.path, data_dir / data_file.path)
+            fragments.append(dataclasses.replace(metadata, id=len(fragments)))
+    lance.LanceDataset.commit(str(path), lance.LanceOperation.Overwrite(schema, fragments))
+    return sum(fragment.physical_rows for fragment in fragments)
+
+
+def _build_and_write_corpus(source: str, count: int, global_offset: int) -> None:
+    corpus_table = _build_corpus_table(source, count, global_offset)
+    corpus_path = CORPUS_PATHS[source]
+    _wipe_path(corpus_path)
+    _write_lance(corpus_table, corpus_path)
+    logger.info("Wrote %d rows to %s", corpus_table.num_rows, corpus_path)
+
+
+def _fingerprint(*parts: Any) -> str:
+    return hashlib.sha256(repr((_GENERATOR_VERSION, *parts)).encode("utf-8")).hexdigest()
+
+
+def _load_manifest() -> dict[str, str]:
+    try:
+        manifest = json.loads(_MANIFEST_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
 def prepare_local_sample(*, force: bool = False) -> Path:
     try:
-        import daft  # type: ignore
+        import lance  # type: ignore  # noqa: F401
+        import pyarrow as pa
     except ImportError as exc:  # pragma: no cover - dependency dependent
-        raise RuntimeError("Daft with Lance support is required to prepare local sample datasets.") from exc
+        raise RuntimeError("pylance and pyarrow are required to prepare local sample datasets.") from exc
 
     _ARTIFACT_ROOT.mkdir(parents=True, exist_ok=True)
 
-    # Fast-path: all files already exist
-    all_exist = (
-        _DATAFINER_SAMPLE_PATH.exists()
-        and all(p.exists() for p in CORPUS_PATHS.values())
-        and VIDEO_CATALOG_COMBINED_PATH.exists()
-        and all(p.exists() for p in VIDEO_CATALOG_PATHS.values())
-    )
-    if all_exist and not force:
-        logger.info("Using existing local sample datasets at %s", _ARTIFACT_ROOT)
-        return _DATAFINER_SAMPLE_PATH
+    # Each artifact is reused only if it exists and the manifest records the fingerprint of the
+    # spec it would be generated from now; everything else is regenerated.
+    previous = {} if force else _load_manifest()
+    manifest: dict[str, str] = {}
+
+    def _is_current(path: Path, fingerprint: str) -> bool:
+        manifest[path.name] = fingerprint
+        return path.exists() and previous.get(path.name) == fingerprint
 
     # ---- Generate rows per corpus and write individual Lance files --------
-    combined_rows: list[dict[str, Any]] = []
-    offset = 0
+    stale_corpora: list[tuple[str, int, int]] = []
+    corpus_offset = 0
     for source, count in _CORPUS_SPECS:
-        corpus_rows = _build_corpus_rows(source, count, offset)
-        combined_rows.extend(corpus_rows)
-        offset += count
-
-        corpus_path = CORPUS_PATHS[source]
-        _wipe_path(corpus_path)
-        daft.from_pylist(corpus_rows).write_lance(str(corpus_path), mode="overwrite")
-        logger.info("Wrote %d rows to %s", len(corpus_rows), corpus_path)
-
-    # ---- Write combined file (backward compat for existing templates) -----
-    _wipe_path(_DATAFINER_SAMPLE_PATH)
-    daft.from_pylist(combined_rows).write_lance(str(_DATAFINER_SAMPLE_PATH), mode="overwrite")
-    logger.info(
-        "Prepared local sample datasets (%d rows, %d corpora) at %s",
-        len(combined_rows),
-        len(_CORPUS_SPECS),
-        _ARTIFACT_ROOT,
-    )
+        fingerprint = _fingerprint(
+            "corpus",
+            source,
+            count,
+            corpus_offset,
+            _SOURCE_DOMAINS[source],
+            _DOMAIN_TEMPLATES,
+            _TOPICS_A,
+            _TOPICS_B,
+            _FIELDS,
+        )
+        if not _is_current(CORPUS_PATHS[source], fingerprint):
+            stale_corpora.append((source, count, corpus_offset))
+        corpus_offset += count
+    if stale_corpora:
+        with ThreadPoolExecutor(max_workers=min(len(stale_corpora), os.cpu_count() or 1)) as pool:
+            list(pool.map(_build_and_write_corpus, *zip(*stale_corpora)))
+
+    # ---- Combined file (backward compat for existing templates) ------------
+    corpus_paths = [CORPUS_PATHS[source] for source, _ in _CORPUS_SPECS]
+    combined_fingerprint = _fingerprint("combined", [manifest[path.name] for path in corpus_paths])
+    if _is_current(_DATAFINER_SAMPLE_PATH, combined_fingerprint) and not stale_corpora:
+        logger.info("Using existing local sample corpora at %s", _ARTIFACT_ROOT)
+    else:
+        _wipe_path(_DATAFINER_SAMPLE_PATH)
+        combined_rows = _combine_lance_datasets(corpus_paths, _DATAFINER_SAMPLE_PATH)
+        logger.info(
+            "Prepared local sample datasets (%d rows, %d corpora, %d regenerated) at %s",
+            combined_rows,
+            len(_CORPUS_SPECS),
+            len(stale_corpora),
+            _ARTIFACT_ROOT,
+        )
 
     # ---- Generate video catalog Lance files --------------------------------
-    video_combined: list[dict[str, Any]] = []
+    stale_catalogs = 0
     video_offset = 0
     for source, count in _VIDEO_CATALOG_SPECS:
-        video_rows = _build_video_catalog_rows(source, count, video_offset)
-        video_combined.extend(video_rows)
-        video_offset += count
-
         catalog_path = VIDEO_CATALOG_PATHS[source]
-        _wipe_path(catalog_path)
-        daft.from_pylist(video_rows).write_lance(str(catalog_path), mode="overwrite")
-        logger.info("Wrote %d video catalog rows to %s", len(video_rows), catalog_path)
+        fingerprint = _fingerprint("video", source, count, video_offset, _RESOLUTIONS, _FPS_OPTIONS, _CODEC_OPTIONS)
+        if not _is_current(catalog_path, fingerprint):
+            video_rows = _build_video_catalog_rows(source, count, video_offset)
+            _wipe_path(catalog_path)
+            _write_lance(pa.Table.from_pylist(video_rows, schema=_video_catalog_schema()), catalog_path)
+            logger.info("Wrote %d video catalog rows to %s", len(video_rows), catalog_path)
+            stale_catalogs += 1
+        video_offset += count
 
-    _wipe_path(VIDEO_CATALOG_COMBINED_PATH)
-    daft.from_pylist(video_combined).write_lance(str(VIDEO_CATALOG_COMBINED_PATH), mode="overwrite")
-    logger.info("Wrote %d total video catalog rows to %s", len(video_combined), VIDEO_CATALOG_COMBINED_PATH)
+    catalog_paths = [VIDEO_CATALOG_PATHS[source] for source, _ in _VIDEO_CATALOG_SPECS]
+    video_fingerprint = _fingerprint("video_combined", [manifest[path.name] for path in catalog_paths])
+    if not _is_current(VIDEO_CATALOG_COMBINED_PATH, video_fingerprint) or stale_catalogs:
+        _wipe_path(VIDEO_CATALOG_COMBINED_PATH)
+        video_rows_total = _combine_lance_datasets(catalog_paths, VIDEO_CATALOG_COMBINED_PATH)
+        logger.info("Wrote %d total video catalog rows to %s", video_rows_total, VIDEO_CATALOG_COMBINED_PATH)
 
+    _MANIFEST_PATH.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
     return _DATAFINER_SAMPLE_PATH
 
 
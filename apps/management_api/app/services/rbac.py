@@ -11,6 +11,7 @@ class AuthContext:
     def __init__(self, user_id: str, roles: list[RoleName]):
         self.user_id = user_id
         self.roles = roles
+        self._team_ids: set[str] | None = None
 
     @property
     def is_admin(self) -> bool:
@@ -24,6 +25,12 @@ class AuthContext:
     def is_aiops(self) -> bool:
         return RoleName.AIOPS_ENGINEER in self.roles
 
+    def team_ids(self, db: Session) -> set[str]:
+        # Memoized for the lifetime of the context, i.e. one request.
+        if self._team_ids is None:
+            self._team_ids = get_user_team_ids(db, self.user_id)
+        return self._team_ids
+
 
 def get_user_roles(db: Session, user_id: str) -> list[RoleName]:
     stmt = select(Role.name).join(UserRole, UserRole.role_id == Role.id).where(UserRole.user_id == user_id)
@@ -41,6 +48,8 @@ def get_user_team_ids(db: Session, user_id: str) -> set[str]:
 
 
 def _assert_pipeline_exists(db: Session, pipeline_id: str) -> Pipeline:
+    # db.get is answered from the session identity map when the row is already loaded (as in the
+    # list endpoints), which a filtered select would turn into an extra round-trip.
     pipeline = db.get(Pipeline, pipeline_id)
     if pipeline is None or pipeline.is_deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pipeline not found")
@@ -48,26 +57,28 @@ def _assert_pipeline_exists(db: Session, pipeline_id: str) -> Pipeline:
 
 
 def assert_pipeline_access(db: Session, ctx: AuthContext, pipeline_id: str, write: bool = False) -> Pipeline:
-    pipeline = _assert_pipeline_exists(db, pipeline_id)
-
     if ctx.is_admin:
-        return pipeline
-
-    if pipeline.owner_user_id == ctx.user_id:
-        return pipeline
-
-    team_ids = get_user_team_ids(db, ctx.user_id)
-    if pipeline.owner_team_id and pipeline.owner_team_id in team_ids:
-        return pipeline
-
-    share_stmt = select(PipelineShare).where(PipelineShare.pipeline_id == pipeline_id)
-    shares = db.execute(share_stmt).scalars().all()
+        return _assert_pipeline_exists(db, pipeline_id)
+
+    # The share check rides along with the pipeline lookup as a correlated subquery; team ids
+    # are memoized on the context, so list endpoints checking many pipelines fetch them once.
+    team_ids = ctx.team_ids(db)
+    share_stmt = select(PipelineShare.id).where(
+        PipelineShare.pipeline_id == Pipeline.id,
+        PipelineShare.team_id.in_(team_ids),
+    )
+    if write:
+        share_stmt = share_stmt.where(PipelineShare.access_level.in_([AccessLevel.WRITE, AccessLevel.OWNER]))
+    stmt = select(Pipeline, share_stmt.exists().label("has_share")).where(
+        Pipeline.id == pipeline_id,
+        Pipeline.is_deleted.is_(False),
+    )
+    row = db.execute(stmt).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pipeline not found")
 
-    for share in shares:
-        if share.team_id not in team_ids:
-            continue
-        if write and share.access_level not in {AccessLevel.WRITE, AccessLevel.OWNER}:
-            continue
+    pipeline = row.Pipeline
+    if pipeline.owner_user_id == ctx.user_id or pipeline.owner_team_id in team_ids or row.has_share:
         return pipeline
 
     if not write and ctx.is_aiops:
@@ -3,71 +3,146 @@ from __future__ import annotations
 import logging
 import threading
 import time
+import uuid
 from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Any
 
+from sqlalchemy import Connection, insert
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
-from app.db.session import SessionLocal
+from app.db.session import SessionLocal, engine
 from app.models import PipelineRun, PipelineRunStatus, PipelineVersion, RunEvent, RunLogsIndex
 from app.schemas.pipeline_spec import PipelineSpecDocument
 from app.services.dataset_executor import run_dataset_pipeline
 from app.services.distributed_executor import run_distributed_pipeline
-from app.services.log_store import run_log_store
+from app.services.log_store import RunLogBuffer, run_log_store
 from app.services.stage_registry import build_stage_executor
 from app.services.xenna_adapter import is_xenna_available
 
 logger = logging.getLogger(__name__)
 
+_RUN_SHARDS = 16
+
+# (epoch second, formatted "YYYY-MM-DDTHH:MM:SS" prefix), swapped as one tuple so threads never see a torn pair.
+_log_second_prefix: tuple[int, str] = (-1, "")
+
+
+def _log_timestamp() -> str:
+    """Format the current UTC time like ``datetime.isoformat(timespec="milliseconds")`` without building a datetime."""
+    global _log_second_prefix
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _log_second_prefix
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _log_second_prefix = (second, prefix)
+    return f"{prefix}.{int((now - second) * 1000):03d}+00:00"
+
+
+def _log_unhandled_run_error(future: Future[None]) -> None:
+    # Submitted futures are not retained, so nothing else would ever observe an exception that
+    # escapes _execute_run's own handlers.
+    if future.cancelled():
+        return
+    exc = future.exception()
+    if exc is not None:
+        logger.error("Run worker raised outside its error handling", exc_info=exc)
+
+
+class _RunShard:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        # Active runs only; the executor owns each Future until it completes, so none are retained here.
+        self.cancel_flags: dict[str, threading.Event] = {}
+
 
 class PipelineRunnerService:
     def __init__(self) -> None:
         settings = get_settings()
         self._executor = ThreadPoolExecutor(max_workers=settings.runner_max_workers)
-        self._cancel_flags: dict[str, threading.Event] = {}
-        self._futures: dict[str, Future[None]] = {}
-        self._lock = threading.Lock()
+        # Pending run events are flushed to the database in batches of this size; the in-memory
+        # log store stays the live progress signal.
+        self._commit_interval = max(settings.runner_commit_interval, 1)
+        self._log_flush_size = max(settings.runner_log_flush_size, 1)
+        self._log_flush_interval = settings.runner_log_flush_interval_ms / 1000
+        self._log_buffers: dict[str, RunLogBuffer] = {}
+        # Bookkeeping is sharded by run id so submits and stops for different runs rarely contend.
+        self._shards = [_RunShard() for _ in range(_RUN_SHARDS)]
+
+    def _shard_for(self, run_id: str) -> _RunShard:
+        return self._shards[hash(run_id) % _RUN_SHARDS]
 
     def submit_run(self, run_id: str) -> None:
-        with self._lock:
-            if run_id in self._futures:
+        shard = self._shard_for(run_id)
+        with shard.lock:
+            if run_id in shard.cancel_flags:
                 return
             cancel_event = threading.Event()
-            self._cancel_flags[run_id] = cancel_event
-            self._futures[run_id] = self._executor.submit(self._execute_run, run_id, cancel_event)
+            shard.cancel_flags[run_id] = cancel_event
+            future = self._executor.submit(self._execute_run, run_id, cancel_event)
+            future.add_done_callback(_log_unhandled_run_error)
 
     def request_stop(self, run_id: str) -> bool:
-        with self._lock:
-            if run_id not in self._cancel_flags:
+        shard = self._shard_for(run_id)
+        with shard.lock:
+            cancel_event = shard.cancel_flags.get(run_id)
+            if cancel_event is None:
                 return False
-            self._cancel_flags[run_id].set()
+            cancel_event.set()
             return True
 
     def _append_log(self, run_id: str, message: str) -> None:
-        ts = datetime.now(timezone.utc).isoformat()
-        line = f"[{ts}] {message}"
-        run_log_store.append(run_id, line)
+        line = f"[{_log_timestamp()}] {message}"
+        buffer = self._log_buffers.get(run_id)
+        if buffer is None:
+            run_log_store.append(run_id, line)
+        else:
+            buffer.append(line)
         logger.info("run=%s %s", run_id, message)
 
     def _create_event(
         self,
-        db: Session,
+        events: list[dict[str, Any]],
         run_id: str,
         event_type: str,
         message: str,
         stage_id: str | None = None,
         payload: dict[str, Any] | None = None,
+        created_at: datetime | None = None,
     ) -> None:
-        event = RunEvent(
-            run_id=run_id,
-            event_type=event_type,
-            stage_id=stage_id,
-            message=message,
-            payload=payload or {},
+        # Events are written in batches, so stamp them when they happen rather than at insert.
+        events.append(
+            {
+                "id": str(uuid.uuid4()),
+                "run_id": run_id,
+                "event_type": event_type,
+                "stage_id": stage_id,
+                "message": message,
+                "payload": payload or {},
+                "created_at": created_at or datetime.now(timezone.utc),
+            }
         )
-        db.add(event)
+
+    @staticmethod
+    def _commit(db: Session, events: list[dict[str, Any]]) -> None:
+        # The unit of work would batch RunEvent objects into one INSERT as well; the events are kept
+        # out of the Session for other reasons. Plain dicts skip per-object instrumentation and
+        # identity-map work, and events queued after a failed commit survive the error-path
+        # rollback, which would expunge pending ORM objects.
+        if events:
+            batch = events.copy()
+            events.clear()
+            db.execute(insert(RunEvent), batch)
+        db.commit()
+
+    @staticmethod
+    def _recover_session(db: Session) -> None:
+        # Always roll back: a failed Core insert can leave the Session looking active while Postgres
+        # has already aborted the transaction. The loaded run stays attached (only expired), so the
+        # error paths can update it without fetching it again.
+        db.rollback()
 
     @staticmethod
     def _should_use_distributed(spec: PipelineSpecDocument) -> bool:
@@ -81,9 +156,18 @@ class PipelineRunnerService:
         return is_xenna_available() and len(spec.stages) > 1
 
     def _execute_run(self, run_id: str, cancel_event: threading.Event) -> None:
-        db = SessionLocal()
+        log_buffer = RunLogBuffer(run_log_store, run_id, self._log_flush_size, self._log_flush_interval)
+        self._log_buffers[run_id] = log_buffer
+        connection: Connection | None = None
+        db: Session | None = None
+        events: list[dict[str, Any]] = []
         start_monotonic = time.perf_counter()
+        run: PipelineRun | None = None
         try:
+            # Hold one connection for the whole run; a bare session would return it to the pool (and
+            # pre-ping it again on checkout) at every intermediate commit.
+            connection = engine.connect()
+            db = SessionLocal(bind=connection)
             run = db.get(PipelineRun, run_id)
             if run is None:
                 return
@@ -96,11 +180,12 @@ class PipelineRunnerService:
                 db.commit()
                 return
 
+            now_utc = datetime.now(timezone.utc)
             run.status = PipelineRunStatus.RUNNING
-            run.start_time = datetime.now(timezone.utc)
+            run.start_time = now_utc
             db.add(run)
-            self._create_event(db, run_id, "run_started", "Run started")
-            db.commit()
+            self._create_event(events, run_id, "run_started", "Run started", created_at=now_utc)
+            self._commit(db, events)
             self._append_log(run_id, "Run entered RUNNING state")
 
             spec = PipelineSpecDocument.model_validate(version.spec_json)
@@ -117,11 +202,13 @@ class PipelineRunnerService:
             if data_model == "dataset":
                 use_distributed = self._should_use_distributed(spec)
                 if use_distributed:
-                    self._create_event(db, run_id, "execution_mode", "Executed with cosmos_xenna distributed executor")
+                    self._create_event(
+                        events, run_id, "execution_mode", "Executed with cosmos_xenna distributed executor"
+                    )
                     self._append_log(run_id, "Executing dataset-mode pipeline via cosmos_xenna distributed executor")
                     dataset_result = run_distributed_pipeline(spec, lambda msg: self._append_log(run_id, msg))
                 else:
-                    self._create_event(db, run_id, "execution_mode", "Executed with dataset DAG adapter")
+                    self._create_event(events, run_id, "execution_mode", "Executed with dataset DAG adapter")
                     self._append_log(run_id, "Executing dataset-mode pipeline")
                     dataset_result = run_dataset_pipeline(spec, lambda msg: self._append_log(run_id, msg))
                 stage_metrics = dataset_result.stage_metrics
@@ -132,13 +219,19 @@ class PipelineRunnerService:
                     f"Dataset execution completed with output {dataset_output_ref.uri} ({dataset_output_ref.format})",
                 )
             else:
-                self._create_event(db, run_id, "execution_mode", "Executed with local linear adapter")
+                self._create_event(events, run_id, "execution_mode", "Executed with local linear adapter")
                 for stage in spec.stages:
                     if cancel_event.is_set():
                         raise InterruptedError("Run stop requested")
 
-                    self._create_event(db, run_id, "stage_started", f"Stage {stage.name} started", stage.stage_id)
-                    db.commit()
+                    self._create_event(
+                        events,
+                        run_id,
+                        "stage_started",
+                        f"Stage {stage.name} started",
+                        stage.stage_id,
+                        created_at=datetime.now(timezone.utc),
+                    )
                     self._append_log(run_id, f"Starting stage {stage.stage_id} ({stage.name})")
 
                     stage_start = time.perf_counter()
@@ -154,14 +247,16 @@ class PipelineRunnerService:
                     stage_metrics.append(metric)
 
                     self._create_event(
-                        db,
+                        events,
                         run_id,
                         "stage_completed",
                         f"Stage {stage.name} completed",
                         stage.stage_id,
                         payload=metric,
+                        created_at=datetime.now(timezone.utc),
                     )
-                    db.commit()
+                    if len(events) >= self._commit_interval:
+                        self._commit(db, events)
                     self._append_log(run_id, f"Completed stage {stage.stage_id} in {stage_duration:.3f}s")
 
             end_ts = datetime.now(timezone.utc)
@@ -201,45 +296,53 @@ class PipelineRunnerService:
             run.artifact_pointers = artifact_pointers
             db.add(run)
 
+            log_buffer.flush()
             logs_index = RunLogsIndex(
                 run_id=run_id,
                 storage_type="in_memory",
                 pointer=run_id,
-                metadata_json={"line_count": len(run_log_store.get_since(run_id, 0)[0])},
+                metadata_json={"line_count": run_log_store.line_count(run_id)},
             )
             db.add(logs_index)
-            self._create_event(db, run_id, "run_completed", "Run completed successfully")
-            db.commit()
+            self._create_event(events, run_id, "run_completed", "Run completed successfully", created_at=end_ts)
+            self._commit(db, events)
             self._append_log(run_id, "Run completed successfully")
 
         except InterruptedError as exc:
-            run = db.get(PipelineRun, run_id)
-            if run is not None:
+            if db is not None and run is not None:
+                self._recover_session(db)
+                end_ts = datetime.now(timezone.utc)
                 run.status = PipelineRunStatus.STOPPED
-                run.end_time = datetime.now(timezone.utc)
+                run.end_time = end_ts
                 run.duration_seconds = time.perf_counter() - start_monotonic
                 run.error_message = str(exc)
                 db.add(run)
-                self._create_event(db, run_id, "run_stopped", str(exc))
-                db.commit()
+                self._create_event(events, run_id, "run_stopped", str(exc), created_at=end_ts)
+                self._commit(db, events)
             self._append_log(run_id, f"Run stopped: {exc}")
         except Exception as exc:
-            run = db.get(PipelineRun, run_id)
-            if run is not None:
+            if db is not None and run is not None:
+                self._recover_session(db)
+                end_ts = datetime.now(timezone.utc)
                 run.status = PipelineRunStatus.FAILED
-                run.end_time = datetime.now(timezone.utc)
+                run.end_time = end_ts
                 run.duration_seconds = time.perf_counter() - start_monotonic
                 run.error_message = str(exc)
                 db.add(run)
-                self._create_event(db, run_id, "run_failed", str(exc))
-                db.commit()
+                self._create_event(events, run_id, "run_failed", str(exc), created_at=end_ts)
+                self._commit(db, events)
             self._append_log(run_id, f"Run failed: {exc}")
             logger.exception("Run execution failed")
         finally:
-            db.close()
-            with self._lock:
-                self._futures.pop(run_id, None)
-                self._cancel_flags.pop(run_id, None)
+            if db is not None:
+                db.close()
+            if connection is not None:
+                connection.close()
+            self._log_buffers.pop(run_id, None)
+            log_buffer.flush()
+            shard = self._shard_for(run_id)
+            with shard.lock:
+                shard.cancel_flags.pop(run_id, None)
 
 
 pipeline_runner_service = PipelineRunnerService()
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import islice
 from typing import Any
 
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, defer
 
 from app.core.config import get_settings
 from app.core.security import get_password_hash
@@ -29,52 +36,103 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 
-def _get_or_create_role(db: Session, role_name: RoleName, description: str) -> Role:
-    role = db.execute(select(Role).where(Role.name == role_name)).scalar_one_or_none()
+@dataclass
+class _SeedCache:
+    """Identity rows the seeder cares about, loaded with one SELECT per table up front.
+
+    The helpers below consult it instead of the database and record what they add, so a seed
+    run issues no further reads for these tables; seed_defaults flushes once per batch.
+    """
+
+    roles: dict[RoleName, Role]
+    users: dict[str, User]
+    teams: dict[str, Team]
+    user_roles: set[tuple[str, str]]
+    team_members: set[tuple[str, str]]
+
+
+def _build_seed_cache(db: Session, role_names: list[RoleName], emails: list[str], team_names: list[str]) -> _SeedCache:
+    return _SeedCache(
+        roles={role.name: role for role in db.execute(select(Role).where(Role.name.in_(role_names))).scalars()},
+        users={user.email: user for user in db.execute(select(User).where(User.email.in_(emails))).scalars()},
+        teams={team.name: team for team in db.execute(select(Team).where(Team.name.in_(team_names))).scalars()},
+        user_roles={
+            (row.user_id, row.role_id)
+            for row in db.execute(
+                select(UserRole.user_id, UserRole.role_id)
+                .join(User, User.id == UserRole.user_id)
+                .where(User.email.in_(emails))
+            )
+        },
+        team_members={
+            (row.team_id, row.user_id)
+            for row in db.execute(
+                select(TeamMember.team_id, TeamMember.user_id)
+                .join(Team, Team.id == TeamMember.team_id)
+                .where(Team.name.in_(team_names))
+            )
+        },
+    )
+
+
+def _get_or_create_role(db: Session, cache: _SeedCache, role_name: RoleName, description: str) -> Role:
+    role = cache.roles.get(role_name)
     if role:
         return role
     role = Role(name=role_name, description=description)
     db.add(role)
-    db.flush()
+    cache.roles[role_name] = role
     return role
 
 
-def _get_or_create_user(db: Session, email: str, full_name: str, password: str) -> User:
-    user = db.execute(select(User).where(User.email == email)).scalar_one_or_none()
+@lru_cache(maxsize=8)
+def _seed_password_hash(password: str) -> str:
+    # Only for the configured default-account passwords: they are fixtures, and reusing one salted
+    # hash per process spares a deliberately slow KDF call every time the database is re-seeded.
+    return get_password_hash(password)
+
+
+def _get_or_create_user(db: Session, cache: _SeedCache, email: str, full_name: str, password: str) -> User:
+    user = cache.users.get(email)
     if user:
         return user
-    user = User(email=email, full_name=full_name, hashed_password=get_password_hash(password), is_active=True)
+    user = User(email=email, full_name=full_name, hashed_password=_seed_password_hash(password), is_active=True)
     db.add(user)
-    db.flush()
+    cache.users[email] = user
     return user
 
 
-def _ensure_user_role(db: Session, user_id: str, role_id: str) -> None:
-    assignment = db.execute(
-        select(UserRole).where(UserRole.user_id == user_id, UserRole.role_id == role_id)
-    ).scalar_one_or_none()
-    if assignment:
-        return
-    db.add(UserRole(user_id=user_id, role_id=role_id))
-
-
-def _get_or_create_team(db: Session, name: str, description: str) -> Team:
-    team = db.execute(select(Team).where(Team.name == name)).scalar_one_or_none()
+def _get_or_create_team(db: Session, cache: _SeedCache, name: str, description: str) -> Team:
+    team = cache.teams.get(name)
     if team:
         return team
     team = Team(name=name, description=description)
     db.add(team)
-    db.flush()
+    cache.teams[name] = team
     return team
 
 
-def _ensure_team_member(db: Session, team_id: str, user_id: str) -> None:
-    member = db.execute(
-        select(TeamMember).where(TeamMember.team_id == team_id, TeamMember.user_id == user_id)
-    ).scalar_one_or_none()
-    if member:
+def _insert_missing_links(
+    db: Session,
+    model: type[UserRole] | type[TeamMember],
+    columns: tuple[str, str],
+    existing: set[tuple[str, str]],
+    desired: list[tuple[str, str]],
+) -> None:
+    # One executemany INSERT for every missing association row instead of an ORM object per row.
+    # ON CONFLICT DO NOTHING on the unique pair covers rows another process inserted after the prefetch.
+    missing = [pair for pair in dict.fromkeys(desired) if pair not in existing]
+    if not missing:
         return
-    db.add(TeamMember(team_id=team_id, user_id=user_id))
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        stmt = pg_insert(model).on_conflict_do_nothing(index_elements=list(columns))
+    elif dialect == "sqlite":
+        stmt = sqlite_insert(model).on_conflict_do_nothing(index_elements=list(columns))
+    else:
+        stmt = insert(model)
+    db.execute(stmt, [dict(zip(columns, pair)) for pair in missing])
+    existing.update(missing)
 
 
 # ---------------------------------------------------------------------------
@@ -83,10 +141,11 @@ def _ensure_team_member(db: Session, team_id: str, user_id: str) -> None:
 
 
 def _make_linear_edges(stage_ids: list[str]) -> list[dict[str, str]]:
-    return [{"source": stage_ids[idx], "target": stage_ids[idx + 1]} for idx in range(len(stage_ids) - 1)]
+    return [{"source": source, "target": target} for source, target in zip(stage_ids, islice(stage_ids, 1, None))]
 
 
 _ARTIFACT_ROOT = "/tmp/pipelineforge_artifacts"
+_ARTIFACT_FILE_URI = f"file://{_ARTIFACT_ROOT}"
 
 
 def _stage_download(*, max_bytes: int = 2_097_152, timeout_seconds: float = 3.0) -> dict[str, Any]:
@@ -197,7 +256,7 @@ def _template_spec(
                 "kind": "inline",
                 "static_data": source_data,
             },
-            "sink": {"kind": "artifact_uri", "uri": f"file://{_ARTIFACT_ROOT}/{sink_path}"},
+            "sink": {"kind": "artifact_uri", "uri": f"{_ARTIFACT_FILE_URI}/{sink_path}"},
         },
         "runtime": {"autoscaling": {}, "retry_policy": {}},
         "observability": {"log_level": "INFO", "metrics_enabled": True, "tracing_enabled": False},
@@ -354,6 +413,19 @@ def _seed_template_specs() -> list[dict[str, Any]]:
     return [*video_templates, *_seed_datafiner_template_specs()]
 
 
+def _dag_stage(stage_id: str, name: str, template: str, params: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "stage_id": stage_id,
+        "name": name,
+        "stage_template": template,
+        "resources": {"cpus": 1.0, "gpus": 0.0},
+        "batch_size": 1,
+        "concurrency_hint": 1,
+        "retries": 0,
+        "params": params,
+    }
+
+
 def _datafiner_template_spec(
     *,
     pipeline_id: str,
@@ -363,16 +435,7 @@ def _datafiner_template_spec(
     sink_path: str,
 ) -> dict[str, Any]:
     stages = [
-        {
-            "stage_id": stage_id,
-            "name": stage_name,
-            "stage_template": stage_template,
-            "resources": {"cpus": 1.0, "gpus": 0.0},
-            "batch_size": 1,
-            "concurrency_hint": 1,
-            "retries": 0,
-            "params": params,
-        }
+        _dag_stage(stage_id, stage_name, stage_template, params)
         for stage_id, stage_name, stage_template, params in stage_templates
     ]
 
@@ -388,8 +451,8 @@ def _datafiner_template_spec(
         "stages": stages,
         "edges": _make_linear_edges([stage["stage_id"] for stage in stages]),
         "io": {
-            "source": {"kind": "dataset_uri", "uri": "file:///tmp/pipelineforge_artifacts/datafiner_input.lance"},
-            "sink": {"kind": "artifact_uri", "uri": f"file://{_ARTIFACT_ROOT}/{sink_path}"},
+            "source": {"kind": "dataset_uri", "uri": f"{_ARTIFACT_FILE_URI}/datafiner_input.lance"},
+            "sink": {"kind": "artifact_uri", "uri": f"{_ARTIFACT_FILE_URI}/{sink_path}"},
         },
         "runtime": {"ray_mode": "local", "autoscaling": {}, "retry_policy": {}},
         "observability": {"log_level": "INFO", "metrics_enabled": True, "tracing_enabled": False},
@@ -406,20 +469,6 @@ def _text_pretraining_curation_spec() -> dict[str, Any]:
     linearly through scoring, filtering, dedup, ranking, mixing, and sampling.
     """
 
-    def _stage(
-        stage_id: str, name: str, template: str, params: dict[str, Any]
-    ) -> dict[str, Any]:
-        return {
-            "stage_id": stage_id,
-            "name": name,
-            "stage_template": template,
-            "resources": {"cpus": 1.0, "gpus": 0.0},
-            "batch_size": 1,
-            "concurrency_hint": 1,
-            "retries": 0,
-            "params": params,
-        }
-
     # --- corpus readers (one per source Lance file) ---
     corpus_names = [
         ("dclm", "corpus_dclm"),
@@ -434,26 +483,26 @@ def _text_pretraining_curation_spec() -> dict[str, Any]:
         sid = f"reader_{file_stem}"
         reader_stage_ids.append(sid)
         reader_stages.append(
-            _stage(
+            _dag_stage(
                 sid,
                 f"Read {source_name}",
                 "builtin.datafiner_lance_reader",
-                {"uri": f"file://{_ARTIFACT_ROOT}/{file_stem}.lance"},
+                {"uri": f"{_ARTIFACT_FILE_URI}/{file_stem}.lance"},
             )
         )
 
     # --- concat + linear processing stages ---
     processing_stages = [
-        _stage("concat", "Concat Corpora", "builtin.datafiner_concat", {}),
-        _stage(
+        _dag_stage("concat", "Concat Corpora", "builtin.datafiner_concat", {}),
+        _dag_stage(
             "token_counter", "Token Counter", "builtin.datafiner_token_counter_v2",
             {"text_column": "text", "output_column": "token_count"},
         ),
-        _stage(
+        _dag_stage(
             "length_filter", "Length Filter", "builtin.datafiner_filter",
             {"predicate": "token_count >= 5"},
         ),
-        _stage(
+        _dag_stage(
             "quality_scorer", "Quality Scorer", "builtin.datafiner_fasttext_scorer",
             {
                 "text_column": "text",
@@ -462,11 +511,11 @@ def _text_pretraining_curation_spec() -> dict[str, Any]:
                 "labels": ["low_quality", "high_quality"],
             },
         ),
-        _stage(
+        _dag_stage(
             "quality_filter", "Quality Filter", "builtin.datafiner_fasttext_filter",
             {"score_column": "quality_score", "min_score": 0.4},
         ),
-        _stage(
+        _dag_stage(
             "domain_scorer", "Domain Scorer", "builtin.datafiner_seq_classifier_scorer",
             {
                 "text_column": "text",
@@ -474,11 +523,11 @@ def _text_pretraining_curation_spec() -> dict[str, Any]:
                 "output_prefix": "mmlu",
             },
         ),
-        _stage(
+        _dag_stage(
             "dedup", "MinHash Dedup", "builtin.datafiner_minhash",
             {"text_column": "text", "deduplicate": True, "num_hashes": 16, "shingle_size": 3},
         ),
-        _stage(
+        _dag_stage(
             "rank_quantile", "Rank Quantile", "builtin.datafiner_add_rank_quantile",
             {
                 "score_column": "quality_score",
@@ -487,26 +536,23 @@ def _text_pretraining_curation_spec() -> dict[str, Any]:
                 "quantile_column": "quality_quantile",
             },
         ),
-        _stage(
+        _dag_stage(
             "interleave", "Balanced Mix", "builtin.datafiner_interleaved_reorder",
             {"group_by": ["source"]},
         ),
-        _stage(
+        _dag_stage(
             "final_sample", "Final Sample", "builtin.datafiner_sampler",
             {"fraction": 0.75, "seed": 42},
         ),
-        _stage("writer", "Write Output", "builtin.datafiner_lance_writer", {}),
+        _dag_stage("writer", "Write Output", "builtin.datafiner_lance_writer", {}),
     ]
 
     all_stages = reader_stages + processing_stages
 
     # --- edges: fan-in from readers to concat, then linear ---
-    edges: list[dict[str, str]] = []
-    for rid in reader_stage_ids:
-        edges.append({"source": rid, "target": "concat"})
-    linear_ids = [s["stage_id"] for s in processing_stages]
-    for i in range(len(linear_ids) - 1):
-        edges.append({"source": linear_ids[i], "target": linear_ids[i + 1]})
+    edges = [{"source": rid, "target": "concat"} for rid in reader_stage_ids] + _make_linear_edges(
+        [stage["stage_id"] for stage in processing_stages]
+    )
 
     return {
         "pipeline_id": "template_text_pretraining_curation",
@@ -524,8 +570,8 @@ def _text_pretraining_curation_spec() -> dict[str, Any]:
         "stages": all_stages,
         "edges": edges,
         "io": {
-            "source": {"kind": "dataset_uri", "uri": f"file://{_ARTIFACT_ROOT}/corpus_dclm.lance"},
-            "sink": {"kind": "artifact_uri", "uri": f"file://{_ARTIFACT_ROOT}/template_text_pretraining_curation.lance"},
+            "source": {"kind": "dataset_uri", "uri": f"{_ARTIFACT_FILE_URI}/corpus_dclm.lance"},
+            "sink": {"kind": "artifact_uri", "uri": f"{_ARTIFACT_FILE_URI}/template_text_pretraining_curation.lance"},
         },
         "runtime": {"ray_mode": "local", "autoscaling": {}, "retry_policy": {}},
         "observability": {"log_level": "INFO", "metrics_enabled": True, "tracing_enabled": False},
@@ -542,18 +588,6 @@ def _video_curation_pipeline_spec() -> dict[str, Any]:
     clip splitting, scoring, filtering, embedding, captioning, and writing.
     """
 
-    def _stage(stage_id: str, name: str, template: str, params: dict[str, Any]) -> dict[str, Any]:
-        return {
-            "stage_id": stage_id,
-            "name": name,
-            "stage_template": template,
-            "resources": {"cpus": 1.0, "gpus": 0.0},
-            "batch_size": 1,
-            "concurrency_hint": 1,
-            "retries": 0,
-            "params": params,
-        }
-
     # --- video catalog readers (one per source Lance file) ---
     reader_sources = [
         ("surveillance", "video_catalog_surveillance"),
@@ -566,46 +600,43 @@ def _video_curation_pipeline_spec() -> dict[str, Any]:
         sid = f"reader_{source_name}"
         reader_stage_ids.append(sid)
         reader_stages.append(
-            _stage(
+            _dag_stage(
                 sid,
                 f"Read {source_name}",
                 "builtin.video_dataset_metadata_reader",
-                {"uri": f"file://{_ARTIFACT_ROOT}/{file_stem}.lance"},
+                {"uri": f"{_ARTIFACT_FILE_URI}/{file_stem}.lance"},
             )
         )
 
     # --- concat + linear processing stages ---
     processing_stages = [
-        _stage("concat", "Concat Sources", "builtin.datafiner_concat", {}),
-        _stage(
+        _dag_stage("concat", "Concat Sources", "builtin.datafiner_concat", {}),
+        _dag_stage(
             "clip_splitter", "Clip Splitter", "builtin.video_dataset_clip_splitter",
             {"clip_duration": 10.0},
         ),
-        _stage("motion_scorer", "Motion Scorer", "builtin.video_dataset_motion_scorer", {}),
-        _stage(
+        _dag_stage("motion_scorer", "Motion Scorer", "builtin.video_dataset_motion_scorer", {}),
+        _dag_stage(
             "motion_filter", "Motion Filter", "builtin.video_dataset_motion_filter",
             {"min_score": 0.15},
         ),
-        _stage("aesthetic_scorer", "Aesthetic Scorer", "builtin.video_dataset_aesthetic_scorer", {}),
-        _stage(
+        _dag_stage("aesthetic_scorer", "Aesthetic Scorer", "builtin.video_dataset_aesthetic_scorer", {}),
+        _dag_stage(
             "aesthetic_filter", "Aesthetic Filter", "builtin.video_dataset_aesthetic_filter",
             {"min_score": 0.3},
         ),
-        _stage("embedding_scorer", "Embedding Scorer", "builtin.video_dataset_embedding_scorer", {}),
-        _stage("caption_generator", "Caption Generator", "builtin.video_dataset_caption_generator", {}),
-        _stage("caption_embedding", "Caption Embedding", "builtin.video_dataset_caption_embedding", {}),
-        _stage("clip_writer", "Clip Writer", "builtin.video_dataset_clip_writer", {}),
+        _dag_stage("embedding_scorer", "Embedding Scorer", "builtin.video_dataset_embedding_scorer", {}),
+        _dag_stage("caption_generator", "Caption Generator", "builtin.video_dataset_caption_generator", {}),
+        _dag_stage("caption_embedding", "Caption Embedding", "builtin.video_dataset_caption_embedding", {}),
+        _dag_stage("clip_writer", "Clip Writer", "builtin.video_dataset_clip_writer", {}),
     ]
 
     all_stages = reader_stages + processing_stages
 
     # --- edges: fan-in from readers to concat, then linear ---
-    edges: list[dict[str, str]] = []
-    for rid in reader_stage_ids:
-        edges.append({"source": rid, "target": "concat"})
-    linear_ids = [s["stage_id"] for s in processing_stages]
-    for i in range(len(linear_ids) - 1):
-        edges.append({"source": linear_ids[i], "target": linear_ids[i + 1]})
+    edges = [{"source": rid, "target": "concat"} for rid in reader_stage_ids] + _make_linear_edges(
+        [stage["stage_id"] for stage in processing_stages]
+    )
 
     return {
         "pipeline_id": "template_video_curation",
@@ -622,8 +653,8 @@ def _video_curation_pipeline_spec() -> dict[str, Any]:
         "stages": all_stages,
         "edges": edges,
         "io": {
-            "source": {"kind": "dataset_uri", "uri": f"file://{_ARTIFACT_ROOT}/video_catalog_surveillance.lance"},
-            "sink": {"kind": "artifact_uri", "uri": f"file://{_ARTIFACT_ROOT}/template_video_curation.lance"},
+            "source": {"kind": "dataset_uri", "uri": f"{_ARTIFACT_FILE_URI}/video_catalog_surveillance.lance"},
+            "sink": {"kind": "artifact_uri", "uri": f"{_ARTIFACT_FILE_URI}/template_video_curation.lance"},
         },
         "runtime": {"ray_mode": "local", "autoscaling": {}, "retry_policy": {}},
         "observability": {"log_level": "INFO", "metrics_enabled": True, "tracing_enabled": False},
@@ -913,23 +944,41 @@ def _seed_datafiner_template_specs() -> list[dict[str, Any]]:
 # ---------------------------------------------------------------------------
 
 
-def _spec_json_changed(current: dict[str, Any], desired: dict[str, Any]) -> bool:
-    import json
+@lru_cache(maxsize=1)
+def _cached_template_specs() -> tuple[tuple[dict[str, Any], dict[str, Any], str], ...]:
+    """Starter templates with their spec as it reads back from a JSON column and its spec hash.
+
+    Built once per process; the dicts are shared between seed calls, so they must be treated as read-only.
+    """
+    specs = []
+    for template in _seed_template_specs():
+        canonical = _canonical_spec_json(template["spec"])
+        specs.append((template, json.loads(canonical), _spec_hash(canonical)))
+    return tuple(specs)
+
+
+def _canonical_spec_json(spec: dict[str, Any]) -> str:
+    return json.dumps(spec, sort_keys=True, separators=(",", ":"))
+
 
-    current_norm = json.dumps(current, sort_keys=True, separators=(",", ":"))
-    desired_norm = json.dumps(desired, sort_keys=True, separators=(",", ":"))
-    return current_norm != desired_norm
+def _spec_hash(canonical_json: str) -> str:
+    return hashlib.blake2b(canonical_json.encode("utf-8"), digest_size=16).hexdigest()
 
 
-def _ensure_template_pipeline(
+def _spec_json_changed(current: dict[str, Any], desired_stored: dict[str, Any]) -> bool:
+    # Both sides are plain JSON values (tuples already turned into lists, keys into strings), so
+    # structural equality matches comparing canonical dumps without serialising either side.
+    return current != desired_stored
+
+
+def _upsert_template_pipeline(
     db: Session,
+    pipeline: Pipeline | None,
     *,
     owner_user_id: str,
     owner_team_id: str,
     template: dict[str, Any],
-) -> None:
-    pipeline = db.execute(select(Pipeline).where(Pipeline.external_id == template["external_id"])).scalar_one_or_none()
-
+) -> Pipeline:
     if pipeline is None:
         pipeline = Pipeline(
             external_id=template["external_id"],
@@ -944,7 +993,6 @@ def _ensure_template_pipeline(
             created_by=owner_user_id,
         )
         db.add(pipeline)
-        db.flush()
     else:
         pipeline.name = template["name"]
         pipeline.description = template["description"]
@@ -954,35 +1002,61 @@ def _ensure_template_pipeline(
         pipeline.owner_team_id = owner_team_id
         pipeline.metadata_links = template["metadata_links"]
         pipeline.is_deleted = False
+    return pipeline
 
-    publish_time = datetime.now(timezone.utc)
-    active_version = db.execute(
-        select(PipelineVersion).where(PipelineVersion.pipeline_id == pipeline.id, PipelineVersion.is_active.is_(True))
-    ).scalar_one_or_none()
-    if active_version is not None:
-        if active_version.status == PipelineVersionStatus.PUBLISHED and not _spec_json_changed(
-            active_version.spec_json, template["spec"]
-        ):
-            return
-        active_version.is_active = False
-
-    next_version = (
+
+def _template_version_is_current(
+    active_version: PipelineVersion | None, stored_spec: dict[str, Any], spec_hash: str
+) -> bool:
+    if active_version is None or active_version.status != PipelineVersionStatus.PUBLISHED:
+        return False
+    # Versions seeded with a hash are compared by digest without loading spec_json; older or
+    # API-created versions fall back to comparing the spec itself.
+    if active_version.spec_hash is not None:
+        return active_version.spec_hash == spec_hash
+    return not _spec_json_changed(active_version.spec_json, stored_spec)
+
+
+def _publish_template_versions(
+    db: Session,
+    stale: list[tuple[Pipeline, PipelineVersion | None, dict[str, Any], str]],
+    *,
+    owner_user_id: str,
+) -> None:
+    """Publish a fresh active version for each (pipeline, active version, template, spec hash) needing one.
+
+    Latest version numbers come from one grouped query and the new rows go out as one executemany
+    INSERT, rather than a max() query and an ORM object per template.
+    """
+    if not stale:
+        return
+
+    latest_numbers = dict(
         db.execute(
-            select(func.max(PipelineVersion.version_number)).where(PipelineVersion.pipeline_id == pipeline.id)
-        ).scalar_one()
-        or 0
-    ) + 1
-    version = PipelineVersion(
-        pipeline_id=pipeline.id,
-        version_number=next_version,
-        status=PipelineVersionStatus.PUBLISHED,
-        is_active=True,
-        spec_json=template["spec"],
-        change_summary="Seeded/updated starter template",
-        created_by=owner_user_id,
-        published_at=publish_time,
+            select(PipelineVersion.pipeline_id, func.max(PipelineVersion.version_number))
+            .where(PipelineVersion.pipeline_id.in_([pipeline.id for pipeline, _, _, _ in stale]))
+            .group_by(PipelineVersion.pipeline_id)
+        ).all()
     )
-    db.add(version)
+    publish_time = datetime.now(timezone.utc)
+    rows: list[dict[str, Any]] = []
+    for pipeline, active_version, template, spec_hash in stale:
+        if active_version is not None:
+            active_version.is_active = False
+        rows.append(
+            {
+                "pipeline_id": pipeline.id,
+                "version_number": (latest_numbers.get(pipeline.id) or 0) + 1,
+                "status": PipelineVersionStatus.PUBLISHED,
+                "is_active": True,
+                "spec_json": template["spec"],
+                "spec_hash": spec_hash,
+                "change_summary": "Seeded/updated starter template",
+                "created_by": owner_user_id,
+                "published_at": publish_time,
+            }
+        )
+    db.execute(insert(PipelineVersion), rows)
 
 
 # ---------------------------------------------------------------------------
@@ -993,31 +1067,48 @@ def _ensure_template_pipeline(
 def seed_defaults(db: Session) -> None:
     settings = get_settings()
 
-    role_admin = _get_or_create_role(db, RoleName.INFRA_ADMIN, "Full system administration")
-    role_dev = _get_or_create_role(db, RoleName.PIPELINE_DEV, "Pipeline authoring and execution")
-    role_aiops = _get_or_create_role(db, RoleName.AIOPS_ENGINEER, "Run observability and operational controls")
+    role_specs = [
+        (RoleName.INFRA_ADMIN, "Full system administration"),
+        (RoleName.PIPELINE_DEV, "Pipeline authoring and execution"),
+        (RoleName.AIOPS_ENGINEER, "Run observability and operational controls"),
+    ]
+    user_specs = [
+        (settings.default_admin_email, "Infra Admin", settings.default_admin_password),
+        (settings.default_dev_email, "Pipeline Developer", settings.default_dev_password),
+        (settings.default_aiops_email, "AIOps Engineer", settings.default_aiops_password),
+    ]
+    team_name = "platform-team"
 
-    admin_user = _get_or_create_user(
+    cache = _build_seed_cache(
         db,
-        settings.default_admin_email,
-        "Infra Admin",
-        settings.default_admin_password,
-    )
-    dev_user = _get_or_create_user(db, settings.default_dev_email, "Pipeline Developer", settings.default_dev_password)
-    aiops_user = _get_or_create_user(
-        db,
-        settings.default_aiops_email,
-        "AIOps Engineer",
-        settings.default_aiops_password,
+        [name for name, _ in role_specs],
+        [email for email, _, _ in user_specs],
+        [team_name],
     )
 
-    _ensure_user_role(db, admin_user.id, role_admin.id)
-    _ensure_user_role(db, dev_user.id, role_dev.id)
-    _ensure_user_role(db, aiops_user.id, role_aiops.id)
+    role_admin, role_dev, role_aiops = (
+        _get_or_create_role(db, cache, name, description) for name, description in role_specs
+    )
+    admin_user, dev_user, aiops_user = (
+        _get_or_create_user(db, cache, email, full_name, password) for email, full_name, password in user_specs
+    )
+    default_team = _get_or_create_team(db, cache, team_name, "Default shared team for local development")
+    db.flush()
 
-    default_team = _get_or_create_team(db, "platform-team", "Default shared team for local development")
-    _ensure_team_member(db, default_team.id, dev_user.id)
-    _ensure_team_member(db, default_team.id, aiops_user.id)
+    _insert_missing_links(
+        db,
+        UserRole,
+        ("user_id", "role_id"),
+        cache.user_roles,
+        [(admin_user.id, role_admin.id), (dev_user.id, role_dev.id), (aiops_user.id, role_aiops.id)],
+    )
+    _insert_missing_links(
+        db,
+        TeamMember,
+        ("team_id", "user_id"),
+        cache.team_members,
+        [(default_team.id, dev_user.id), (default_team.id, aiops_user.id)],
+    )
 
     # Prepare the local sample Lance dataset that datafiner templates reference.
     try:
@@ -1027,12 +1118,40 @@ def seed_defaults(db: Session) -> None:
     except Exception:
         logger.warning("Could not prepare local sample dataset; datafiner pipelines may fail", exc_info=True)
 
-    for template in _seed_template_specs():
-        _ensure_template_pipeline(
+    templates = _cached_template_specs()
+    external_ids = [template["external_id"] for template, _, _ in templates]
+    existing_pipelines = {
+        pipeline.external_id: pipeline
+        for pipeline in db.execute(select(Pipeline).where(Pipeline.external_id.in_(external_ids))).scalars()
+    }
+    pipelines = [
+        _upsert_template_pipeline(
             db,
+            existing_pipelines.get(template["external_id"]),
             owner_user_id=dev_user.id,
             owner_team_id=default_team.id,
             template=template,
         )
+        for template, _, _ in templates
+    ]
+    db.flush()
+
+    active_versions = {
+        version.pipeline_id: version
+        for version in db.execute(
+            select(PipelineVersion)
+            .options(defer(PipelineVersion.spec_json))
+            .where(
+                PipelineVersion.pipeline_id.in_([pipeline.id for pipeline in pipelines]),
+                PipelineVersion.is_active.is_(True),
+            )
+        ).scalars()
+    }
+    stale = [
+        (pipeline, active_versions.get(pipeline.id), template, spec_hash)
+        for pipeline, (template, stored_spec, spec_hash) in zip(pipelines, templates, strict=True)
+        if not _template_version_is_current(active_versions.get(pipeline.id), stored_spec, spec_hash)
+    ]
+    _publish_template_versions(db, stale, owner_user_id=dev_user.id)
 
     db.commit()
@@ -4,7 +4,9 @@ import hashlib
 import importlib
 import json
 import time
+from collections.abc import Iterator
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Callable, ClassVar
 
@@ -732,19 +734,41 @@ def instantiate_stage(stage: StageDefinition) -> Any:
     return _load_dynamic_stage(stage.python_import_path, params)
 
 
-def build_stage_executor(stage: StageDefinition) -> StageExecutor:
-    instance = instantiate_stage(stage)
-
+def _wrap_executor(stage_id: str, name: str, instance: Any) -> StageExecutor:
     process_data = getattr(instance, "process_data", None)
     if not callable(process_data):
-        raise ValueError(f"Stage {stage.name} does not expose process_data(list) method")
+        raise ValueError(f"Stage {name} does not expose process_data(list) method")
 
     def _runner(data: list[Any]) -> list[Any]:
         result = process_data(data)
         if result is None:
             return []
-        if not isinstance(result, list):
-            return [result]
-        return result
+        if isinstance(result, list):
+            return result
+        # Generator-style stages are drained once here so callers can len() and re-read the output.
+        if isinstance(result, Iterator):
+            return list(result)
+        return [result]
+
+    return StageExecutor(stage_id=stage_id, name=name, run=_runner)
+
+
+@lru_cache(maxsize=512)
+def _build_template_executor(stage_template: str, params_json: str, stage_id: str, name: str) -> StageExecutor:
+    if stage_template not in _TEMPLATE_REGISTRY:
+        raise ValueError(f"Unknown stage template: {stage_template}")
+    return _wrap_executor(stage_id, name, _TEMPLATE_REGISTRY[stage_template](**json.loads(params_json)))
+
+
+def build_stage_executor(stage: StageDefinition) -> StageExecutor:
+    # Built-in templates only hold their config, so executors are shared across runs keyed on that
+    # config; dynamically imported stages may keep state and are built fresh every time.
+    if stage.stage_template:
+        try:
+            params_json = json.dumps(stage.params or {}, sort_keys=True)
+        except TypeError:
+            pass
+        else:
+            return _build_template_executor(stage.stage_template, params_json, stage.stage_id, stage.name)
 
-    return StageExecutor(stage_id=stage.stage_id, name=stage.name, run=_runner)
+    return _wrap_executor(stage.stage_id, stage.name, instantiate_stage(stage))
@@ -1,7 +1,18 @@
 from __future__ import annotations
 
+import threading
 import time
 
+from app.db.session import SessionLocal
+from app.models import Pipeline, PipelineRun, PipelineRunStatus, PipelineVersion, RunEvent, TeamMember, UserRole
+from app.services import runner as runner_module
+from app.services.log_store import run_log_store
+from app.services.runner import pipeline_runner_service
+from app.services.seed import seed_defaults
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
 
 def _login(client, email: str, password: str) -> dict[str, str]:
     resp = client.post("/api/v1/auth/login", json={"email": email, "password": password})
@@ -25,6 +36,102 @@ def test_seeded_starter_templates_are_listed(client) -> None:
     assert expected.issubset(external_ids)
 
 
+def test_seed_defaults_is_idempotent() -> None:
+    def _counts(db) -> list[int]:
+        return [
+            db.execute(select(func.count()).select_from(model)).scalar_one()
+            for model in (Pipeline, PipelineVersion, TeamMember, UserRole)
+        ]
+
+    with SessionLocal() as db:
+        before = _counts(db)
+        seed_defaults(db)
+        assert _counts(db) == before
+        assert None not in db.execute(select(PipelineVersion.spec_hash)).scalars().all()
+
+
+def _create_queued_run() -> str:
+    with SessionLocal() as db:
+        version = db.execute(select(PipelineVersion).limit(1)).scalar_one()
+        pipeline = db.get(Pipeline, version.pipeline_id)
+        run = PipelineRun(
+            pipeline_id=pipeline.id,
+            pipeline_version_id=version.id,
+            initiated_by=pipeline.owner_user_id,
+        )
+        db.add(run)
+        db.commit()
+        return run.id
+
+
+def test_stop_before_execution_marks_run_stopped() -> None:
+    run_id = _create_queued_run()
+
+    cancel_event = threading.Event()
+    cancel_event.set()
+    pipeline_runner_service._execute_run(run_id, cancel_event)
+
+    with SessionLocal() as db:
+        run = db.get(PipelineRun, run_id)
+        assert run.status == PipelineRunStatus.STOPPED
+        assert run.end_time is not None
+        assert run.error_message == "Run stop requested before execution"
+        event_types = db.execute(select(RunEvent.event_type).where(RunEvent.run_id == run_id)).scalars().all()
+        assert set(event_types) == {"run_started", "run_stopped"}
+
+
+def test_failed_event_insert_marks_run_failed(monkeypatch) -> None:
+    run_id = _create_queued_run()
+    create_event = pipeline_runner_service._create_event
+
+    def _create_invalid_start_event(events, event_run_id, event_type, *args, **kwargs):
+        create_event(events, event_run_id, event_type, *args, **kwargs)
+        if event_type == "run_started":
+            events[-1]["run_id"] = None
+
+    rollbacks: list[Session] = []
+    session_rollback = Session.rollback
+
+    def _record_rollback(session: Session) -> None:
+        rollbacks.append(session)
+        session_rollback(session)
+
+    monkeypatch.setattr(pipeline_runner_service, "_create_event", _create_invalid_start_event)
+    # sqlite keeps the transaction usable after the failed insert, so check the rollback directly.
+    monkeypatch.setattr(Session, "rollback", _record_rollback)
+    pipeline_runner_service._execute_run(run_id, threading.Event())
+    monkeypatch.undo()
+
+    assert rollbacks
+
+    with SessionLocal() as db:
+        run = db.get(PipelineRun, run_id)
+        assert run.status == PipelineRunStatus.FAILED
+        assert run.end_time is not None
+        event_types = db.execute(select(RunEvent.event_type).where(RunEvent.run_id == run_id)).scalars().all()
+        assert event_types == ["run_failed"]
+
+
+def test_failed_connection_checkout_releases_run_bookkeeping(monkeypatch) -> None:
+    run_id = _create_queued_run()
+
+    class _UnavailableEngine:
+        def connect(self):
+            raise OperationalError("SELECT 1", {}, Exception("connection refused"))
+
+    monkeypatch.setattr(runner_module, "engine", _UnavailableEngine())
+    shard = pipeline_runner_service._shard_for(run_id)
+    cancel_event = threading.Event()
+    with shard.lock:
+        shard.cancel_flags[run_id] = cancel_event
+    pipeline_runner_service._execute_run(run_id, cancel_event)
+
+    assert run_id not in shard.cancel_flags
+    assert run_id not in pipeline_runner_service._log_buffers
+    lines, _ = run_log_store.get_since(run_id, 0)
+    assert any("Run failed" in line for line in lines)
+
+
 def test_end_to_end_pipeline_run_flow(client) -> None:
     dev_headers = _login(client, "dev@pipelineforge.local", "Dev123!")
     admin_headers = _login(client, "admin@pipelineforge.local", "Admin123!")
@@ -54,6 +54,49 @@ def test_dataset_executor_topological_dag() -> None:
     assert result.output_ref.metadata["inputs"] == ["root_a", "root_b"]
 
 
+def test_dataset_executor_runs_independent_branches_in_parallel() -> None:
+    spec = PipelineSpecDocument.model_validate(
+        {
+            "name": "dataset-parallel",
+            "data_model": "dataset",
+            "execution_mode": "batch",
+            "stages": [
+                {
+                    "stage_id": "root_a",
+                    "name": "Root A",
+                    "python_import_path": "app.services.dataset_stage_fixtures:EmitDatasetStage",
+                    "params": {"uri": "lance://a"},
+                },
+                {
+                    "stage_id": "root_b",
+                    "name": "Root B",
+                    "python_import_path": "app.services.dataset_stage_fixtures:EmitDatasetStage",
+                    "params": {"uri": "lance://b"},
+                },
+                {
+                    "stage_id": "join",
+                    "name": "Join",
+                    "python_import_path": "app.services.dataset_stage_fixtures:JoinDatasetStage",
+                },
+            ],
+            "edges": [
+                {"source": "root_a", "target": "join"},
+                {"source": "root_b", "target": "join"},
+            ],
+            "runtime": {"max_parallel_stages": 2},
+            "io": {
+                "source": {"kind": "dataset_uri", "uri": "lance://input"},
+                "sink": {"kind": "artifact_uri", "uri": "lance://output"},
+            },
+        }
+    )
+
+    result = run_dataset_pipeline(spec, lambda _: None)
+
+    assert [item["stage_id"] for item in result.stage_metrics] == ["root_a", "root_b", "join"]
+    assert result.output_ref.uri == "lance://joined/lance://a+lance://b"
+
+
 def test_dataset_executor_supports_stage_template_dataset_stages(tmp_path: Path) -> None:
     daft = pytest.importorskip("daft")
     if not hasattr(daft, "read_lance"):
@@ -107,6 +150,125 @@ def test_dataset_executor_supports_stage_template_dataset_stages(tmp_path: Path)
     assert rows == [{"id": 2, "score": 0.8}, {"id": 3, "score": 0.5}]
 
 
+def test_dataset_executor_fuses_frame_transform_chains(tmp_path: Path) -> None:
+    daft = pytest.importorskip("daft")
+    if not hasattr(daft, "read_lance"):
+        pytest.skip("Daft Lance support is unavailable: read_lance missing")
+
+    input_uri = str(tmp_path / "input.lance")
+    texts = [f"document number {index}" for index in range(20)]
+    daft.from_pydict({"id": list(range(20)), "text": texts}).write_lance(input_uri, mode="overwrite")
+
+    spec = PipelineSpecDocument.model_validate(
+        {
+            "name": "dataset-fused-chain",
+            "data_model": "dataset",
+            "execution_mode": "batch",
+            "stages": [
+                {
+                    "stage_id": "reader",
+                    "name": "Reader",
+                    "stage_template": "builtin.dataset_lance_reader",
+                    "params": {"uri": input_uri},
+                },
+                {"stage_id": "score", "name": "Score", "stage_template": "builtin.datafiner_fasttext_scorer"},
+                {
+                    "stage_id": "keep",
+                    "name": "Keep",
+                    "stage_template": "builtin.datafiner_fasttext_filter",
+                    "params": {"min_score": 0.25, "max_score": 0.75},
+                },
+                {"stage_id": "rank", "name": "Rank", "stage_template": "builtin.datafiner_add_rank_quantile"},
+            ],
+            "edges": [
+                {"source": "reader", "target": "score"},
+                {"source": "score", "target": "keep"},
+                {"source": "keep", "target": "rank"},
+            ],
+            "runtime": {"ray_mode": "local", "work_dir": str(tmp_path)},
+            "io": {"source": {"kind": "dataset_uri", "uri": input_uri}},
+        }
+    )
+
+    result = run_dataset_pipeline(spec, lambda _: None)
+
+    metrics = {item["stage_id"]: item for item in result.stage_metrics}
+    assert metrics["score"]["fused_into"] == "keep"
+    assert metrics["keep"]["fused_into"] == "rank"
+    assert "fused_into" not in metrics["rank"]
+    assert sorted(path.name for path in tmp_path.glob("*.lance")) == sorted(
+        ["input.lance", Path(metrics["reader"]["output_uri"]).name, Path(result.output_ref.uri).name]
+    )
+
+    rows = daft.read_lance(result.output_ref.uri).to_arrow().to_pylist()
+    assert rows
+    assert all(0.25 <= row["fasttext_score"] <= 0.75 for row in rows)
+    assert [row["rank"] for row in rows] == list(range(1, len(rows) + 1))
+    assert [row["fasttext_score"] for row in rows] == sorted((row["fasttext_score"] for row in rows), reverse=True)
+
+
+@pytest.mark.parametrize("max_parallel_stages", [1, 2])
+def test_dataset_executor_keeps_fused_branches_apart(tmp_path: Path, max_parallel_stages: int) -> None:
+    daft = pytest.importorskip("daft")
+    if not hasattr(daft, "read_lance"):
+        pytest.skip("Daft Lance support is unavailable: read_lance missing")
+
+    input_uri = str(tmp_path / "input.lance")
+    scores = [index / 10 for index in range(10)]
+    daft.from_pydict({"id": list(range(10)), "fasttext_score": scores}).write_lance(input_uri, mode="overwrite")
+
+    spec = PipelineSpecDocument.model_validate(
+        {
+            "name": "dataset-fused-branches",
+            "data_model": "dataset",
+            "execution_mode": "batch",
+            "stages": [
+                {
+                    "stage_id": "reader",
+                    "name": "Reader",
+                    "stage_template": "builtin.dataset_lance_reader",
+                    "params": {"uri": input_uri},
+                },
+                {
+                    "stage_id": "keep_high",
+                    "name": "Keep High",
+                    "stage_template": "builtin.datafiner_fasttext_filter",
+                    "params": {"min_score": 0.75},
+                },
+                {"stage_id": "rank_high", "name": "Rank High", "stage_template": "builtin.datafiner_add_rank_quantile"},
+                {
+                    "stage_id": "keep_low",
+                    "name": "Keep Low",
+                    "stage_template": "builtin.datafiner_fasttext_filter",
+                    "params": {"min_score": 0.0, "max_score": 0.25},
+                },
+                {"stage_id": "rank_low", "name": "Rank Low", "stage_template": "builtin.datafiner_add_rank_quantile"},
+                {"stage_id": "union", "name": "Union", "stage_template": "builtin.dataset_union_by_name"},
+            ],
+            "edges": [
+                {"source": "reader", "target": "keep_high"},
+                {"source": "keep_high", "target": "rank_high"},
+                {"source": "reader", "target": "keep_low"},
+                {"source": "keep_low", "target": "rank_low"},
+                {"source": "rank_high", "target": "union"},
+                {"source": "rank_low", "target": "union"},
+            ],
+            "runtime": {"ray_mode": "local", "work_dir": str(tmp_path), "max_parallel_stages": max_parallel_stages},
+            "io": {"source": {"kind": "dataset_uri", "uri": input_uri}},
+        }
+    )
+
+    result = run_dataset_pipeline(spec, lambda _: None)
+
+    metrics = {item["stage_id"]: item for item in result.stage_metrics}
+    assert metrics["keep_high"]["fused_into"] == "rank_high"
+    assert metrics["keep_low"]["fused_into"] == "rank_low"
+    assert metrics["rank_high"]["output_uri"] != metrics["rank_low"]["output_uri"]
+
+    rows = daft.read_lance(result.output_ref.uri).to_arrow().to_pylist()
+    assert sorted(row["fasttext_score"] for row in rows) == [0.0, 0.1, 0.2, 0.8, 0.9]
+
+
 def test_dataset_runtime_falls_back_to_native_runner_when_ray_runner_setup_fails(monkeypatch) -> None:
     logs: list[str] = []
     calls: list[tuple[str, object]] = []
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+from app.services.dataset_stages import (
+    AddRankQuantileStage,
+    ColumnAliasStage,
+    ConcatenateColumnsStage,
+    ConcatStage,
+    ConversationToParagraphStage,
+    DuplicateSampleRatioStage,
+    FilterByRatioStage,
+    FilterStage,
+    FlattenStage,
+    GroupFlattenStage,
+    InterleavedReorderStage,
+    LanceWriterStage,
+    MinHashStage,
+    ReorderStage,
+    SamplerStage,
+    TokenCounterV2Stage,
+    UnionByNameStage,
+    UnionByPositionStage,
+    _filter_predicate,
+    _rows_from_df,
+    _rows_to_df,
+)
+from app.services.dataset_types import DatasetRef, DatasetRuntimeContext
+
+
+def _run_stage(tmp_path: Path, stage: Any, *inputs: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    daft = pytest.importorskip("daft")
+    if not hasattr(daft, "read_lance"):
+        pytest.skip("Daft Lance support is unavailable: read_lance missing")
+
+    refs: dict[str, DatasetRef] = {}
+    for index, rows in enumerate(inputs):
+        input_uri = str(tmp_path / f"input_{index}.lance")
+        daft.from_pylist(rows).write_lance(input_uri, mode="overwrite")
+        refs["upstream" if len(inputs) == 1 else f"upstream_{index}"] = DatasetRef(uri=input_uri)
+    ctx = DatasetRuntimeContext(
+        io_config=None,
+        pipeline_io=None,
+        storage_options={},
+        ray_mode="local",
+        ray_address=None,
+        work_dir=str(tmp_path),
+    )
+    output_ref = stage.run(ctx, refs)
+    return daft.read_lance(output_ref.uri).to_arrow().to_pylist()
+
+
+def test_filter_stage_structured_params_match_predicate_string(tmp_path: Path) -> None:
+    pytest.importorskip("daft")
+    rows = [{"id": 1, "score": 0.1}, {"id": 2, "score": 0.8}, {"id": 3, "score": 0.5}]
+
+    structured = {"column": "score", "op": ">=", "value": 0.5}
+    assert not isinstance(_filter_predicate(structured), str)
+    assert _filter_predicate(structured) is _filter_predicate(dict(structured))
+
+    by_expression = _run_stage(tmp_path / "expr", FilterStage(structured), rows)
+    by_string = _run_stage(tmp_path / "sql", FilterStage({"predicate": "score >= 0.5"}), rows)
+    assert sorted(row["id"] for row in by_expression) == [2, 3]
+    assert sorted(row["id"] for row in by_expression) == sorted(row["id"] for row in by_string)
+
+
+def test_lance_writer_stage_copies_local_dataset(tmp_path: Path) -> None:
+    pytest.importorskip("daft")
+    rows = [{"id": 1, "text": "a"}, {"id": 2, "text": "b"}]
+    output_uri = str(tmp_path / "sink.lance")
+
+    written = _run_stage(tmp_path, LanceWriterStage({"output_uri": output_uri}), rows)
+    assert written == rows
+    assert (tmp_path / "sink.lance" / "_versions").is_dir()
+
+    rewritten = _run_stage(tmp_path, LanceWriterStage({"output_uri": output_uri}), rows[:1])
+    assert rewritten == rows[:1]
+    lance = pytest.importorskip("lance")
+    # Overwriting publishes a new version on the sink rather than replacing its history.
+    assert lance.dataset(output_uri).version == 2
+
+
+def test_lance_writer_stage_publishes_only_the_latest_source_version(tmp_path: Path) -> None:
+    daft = pytest.importorskip("daft")
+    lance = pytest.importorskip("lance")
+    source_uri = str(tmp_path / "source.lance")
+    for index in range(3):
+        daft.from_pylist([{"id": index}]).write_lance(source_uri, mode="overwrite")
+    output_uri = str(tmp_path / "sink.lance")
+    ctx = DatasetRuntimeContext(
+        io_config=None,
+        pipeline_io=None,
+        storage_options={},
+        ray_mode="local",
+        ray_address=None,
+        work_dir=str(tmp_path),
+    )
+
+    LanceWriterStage({"output_uri": output_uri}).run(ctx, {"upstream": DatasetRef(uri=source_uri)})
+
+    sink = lance.dataset(output_uri)
+    assert sink.version == 1
+    assert sink.to_table().to_pylist() == [{"id": 2}]
+    assert len(list((tmp_path / "sink.lance" / "data").iterdir())) == 1
+
+
+def test_lance_writer_stage_keeps_unrelated_files_in_an_existing_sink(tmp_path: Path) -> None:
+    pytest.importorskip("daft")
+    rows = [{"id": 1, "text": "a"}, {"id": 2, "text": "b"}]
+    sink_dir = tmp_path / "exports"
+    sink_dir.mkdir()
+    (sink_dir / "keep_me.txt").write_text("not a Lance file")
+
+    written = _run_stage(tmp_path, LanceWriterStage({"output_uri": str(sink_dir)}), rows)
+
+    assert written == rows
+    assert (sink_dir / "keep_me.txt").read_text() == "not a Lance file"
+
+
+def test_union_by_name_stage_aligns_columns_across_inputs(tmp_path: Path) -> None:
+    pytest.importorskip("daft")
+    first = [{"id": 1, "text": "a"}, {"id": 2, "text": "b"}]
+    second = [{"text": "b", "id": 2}]
+    third = [{"id": 3, "text": "c"}]
+
+    distinct = _run_stage(tmp_path / "distinct", UnionByNameStage({}), first, second, third)
+    assert sorted((row["id"], row["text"]) for row in distinct) == [(1, "a"), (2, "b"), (3, "c")]
+
+    union_all = _run_stage(tmp_path / "all", UnionByNameStage({"distinct": False}), first, second, third)
+    assert sorted(row["id"] for row in union_all) == [1, 2, 2, 3]
+
+
+def test_rows_to_df_empty_output_keeps_upstream_schema() -> None:
+    daft = pytest.importorskip("daft")
+    df = daft.from_pylist([{"id": 1, "tags": ["a"]}])
+    assert _rows_from_df(df) == [{"id": 1, "tags": ["a"]}]
+
+    empty = _rows_to_df([], fallback_df=df)
+    assert empty.column_names == ["id", "tags"]
+    assert empty.to_arrow().schema == df.to_arrow().schema
+    assert empty.to_pylist() == []
+
+
+def test_conversation_to_paragraph_stage_joins_turns(tmp_path: Path) -> None:
+    pytest.importorskip("daft")
+    rows = [
+        {
+            "id": 1,
+            "conversation": [
+                {"content": "hello", "text": None},
+                {"content": "", "text": "there"},
+                {"content": None, "text": None},
+            ],
+        },
+        {"id": 2, "conversation": []},
+        {"id": 3, "conversation": None},
+    ]
+
+    output = _run_stage(tmp_path, ConversationToParagraphStage({"separator": " | "}), rows)
+    assert {row["id"]: row["paragraph"] for row in output} == {1: "hello | there", 2: "", 3: ""}
+
+
+def test_filter_by_ratio_stage_is_seeded_and_bounded(tmp_path: Path) -> None:
+    pytest.importorskip("daft")
+    rows = [{"id": index} for index in range(200)]
+
+    first = _run_stage(tmp_path / "a", FilterByRatioStage({"keep_ratio": 0.5, "seed": 7}), rows)
+    second = _run_stage(tmp_path / "b", FilterByRatioStage({"keep_ratio": 0.5, "seed": 7}), rows)
+    assert first == second
+    assert 50 < len(first) < 150
+
+    assert len(_run_stage(tmp_path / "all", FilterByRatioStage({"keep_ratio": 1.0}), rows)) == 200
+    assert _run_stage(tmp_path / "none", FilterByRatioStage({"keep_ratio": 0.0}), rows) == []
+
+
+def test_column_stages_only_touch_named_columns(tmp_path: Path) -> None:
+    pytest.importorskip("daft")
+    rows = [{"id": 1, "title": "a", "body": None}, {"id": 2, "title": "b", "body": "c"}]
+
+    aliased = _run_stage(tmp_path / "alias", ColumnAliasStage({"source": "title", "target": "heading"}), rows)
+    assert aliased == [{"id": 1, "heading": "a", "body": None}, {"id": 2, "heading": "b", "body": "c"}]
+
+    stage = ConcatenateColumnsStage({"columns": ["title", "body"], "separator": "-", "output_column": "joined"})
+    concatenated = _run_stage(tmp_path / "concat", stage, rows)
+    assert [row["joined"] for row in concatenated] == ["a", "b-c"]
+    assert [row["id"] for row in concatenated] == [1, 2]
+
+
+def test_minhash_stage_deduplicates_identical_text(tmp_path: Path) -> None:
+    pytest.importorskip("daft")
+    rows = [
+        {"id": 1, "text": "The quick brown fox jumps over the lazy dog"},
+        {"id": 2, "text": "the quick brown fox, jumps over the lazy dog!"},
+        {"id": 3, "text": "An entirely different sentence about data pipelines"},
+    ]
+
+    output = _run_stage(tmp_path, MinHashStage({"deduplicate": True, "num_hashes": 8}), rows)
+    assert [row["id"] for row in output] == [1, 3]
+    signatures = [row["minhash"].split(",") for row in output]
+    assert all(len(signature) == 8 for signature in signatures)
+    assert signatures[0] != signatures[1]
+
+
+def test_duplicate_and_sampler_stages_gather_rows_by_index(tmp_path: Path) -> None:
+    pytest.importorskip("daft")
+    rows = [{"id": index} for index in range(10)]
+
+    doubled = _run_stage(tmp_path / "dup", DuplicateSampleRatioStage({"ratio": 2.0}), rows)
+    assert [row["id"] for row in doubled] == [index for index in range(10) for _ in range(2)]
+
+    partial = _run_stage(tmp_path / "partial", DuplicateSampleRatioStage({"ratio": 1.5, "seed": 3}), rows)
+    assert 10 <= len(partial) <= 20
+    assert [row["id"] for row in partial] == sorted(row["id"] for row in partial)
+
+    sampled = _run_stage(tmp_path / "sample", SamplerStage({"sample_size": 4, "seed": 1}), rows)
+    assert len({row["id"] for row in sampled}) == 4
+
+    with_replacement = SamplerStage({"sample_size": 25, "with_replacement": True, "seed": 1})
+    resampled = _run_stage(tmp_path / "replace", with_replacement, rows)
+    assert len(resampled) == 25
+    assert {row["id"] for row in resampled} <= set(range(10))
+
+
+def test_add_rank_quantile_stage_buckets_by_descending_score(tmp_path: Path) -> None:
+    pytest.importorskip("daft")
+    rows = [{"id": index, "score": None if index == 0 else index / 10} for index in range(10)]
+
+    ranked = _run_stage(tmp_path, AddRankQuantileStage({"score_column": "score", "quantiles": 3}), rows)
+    assert [row["id"] for row in ranked] == [9, 8, 7, 6, 5, 4, 3, 2, 1, 0]
+    assert [row["rank"] for row in ranked] == list(range(1, 11))
+    assert [row["quantile"] for row in ranked] == [1, 1, 1, 1, 2, 2, 2, 3, 3, 3]
+
+
+def test_reorder_stages_gather_rows_without_python_dicts(tmp_path: Path) -> None:
+    pytest.importorskip("daft")
+    rows = [{"id": index, "group": ["b", "a", None][index % 3], "rank": index % 2} for index in range(7)]
+
+    reordered = _run_stage(tmp_path / "reorder", ReorderStage({"by": "group,rank", "desc": [False, True]}), rows)
+    assert [row["id"] for row in reordered] == [1, 4, 3, 0, 6, 5, 2]
+
+    interleaved = _run_stage(tmp_path / "interleave", InterleavedReorderStage({"group_by": "group"}), rows)
+    assert [row["id"] for row in interleaved] == [2, 1, 0, 5, 4, 3, 6]
+
+    positional = _run_stage(tmp_path / "position", UnionByPositionStage({}), rows[:1], [{"a": "c", "b": 9}])
+    assert positional == [{"id": 0, "group": "b", "rank": 0}, {"id": 9, "group": "c", "rank": None}]
+
+
+def test_token_counter_v2_counts_regex_matches_in_arrow(tmp_path: Path) -> None:
+    pytest.importorskip("daft")
+    rows = [{"id": 0, "text": "Hello, world_1 foo"}, {"id": 1, "text": None}, {"id": 2, "text": "héllo wörld"}]
+
+    counted = _run_stage(tmp_path, TokenCounterV2Stage({}), rows)
+    assert [row["token_count_v2"] for row in counted] == [3, 0, 4]
+
+
+def test_concat_stage_unions_inputs_with_different_columns(tmp_path: Path) -> None:
+    pytest.importorskip("daft")
+    first = [{"id": 1, "text": "a"}, {"id": 2, "text": "b"}]
+    second = [{"id": 2, "text": "b"}, {"id": 3, "text": "c"}]
+    third = [{"id": 4, "score": 0.5}]
+
+    merged = _run_stage(tmp_path, ConcatStage({}), first, second, third)
+    assert sorted((row["id"], row.get("text"), row.get("score")) for row in merged) == [
+        (1, "a", None),
+        (2, "b", None),
+        (3, "c", None),
+        (4, None, 0.5),
+    ]
+
+
+def test_flatten_stage_explodes_lists_and_copies_scalars(tmp_path: Path) -> None:
+    pytest.importorskip("daft")
+    rows = [{"id": 1, "items": [1, 2], "label": "x"}, {"id": 2, "items": [], "label": None}]
+
+    exploded = _run_stage(tmp_path / "list", FlattenStage({"output_column": "item"}), rows)
+    assert [(row["id"], row["item"]) for row in exploded] == [(1, 1), (1, 2)]
+
+    kept = _run_stage(tmp_path / "keep", FlattenStage({"keep_empty": True}), rows)
+    assert [(row["id"], row["items"]) for row in kept] == [(1, 1), (1, 2), (2, None)]
+
+    scalar = _run_stage(tmp_path / "scalar", FlattenStage({"column": "label", "output_column": "tag"}), rows)
+    assert [row["tag"] for row in scalar] == ["x", None]
+
+
+def test_group_flatten_stage_keeps_first_appearance_order(tmp_path: Path) -> None:
+    pytest.importorskip("daft")
+    rows = [
+        {"group": "b", "items": [1, 2]},
+        {"group": None, "items": None},
+        {"group": "a", "items": []},
+        {"group": "b", "items": [3]},
+        {"group": None, "items": [4]},
+    ]
+
+    grouped = _run_stage(tmp_path, GroupFlattenStage({"group_by": "group", "output_column": "merged"}), rows)
+    assert [(row["group"], row["merged"]) for row in grouped] == [("b", [1, 2, 3]), (None, [4]), ("a", [])]
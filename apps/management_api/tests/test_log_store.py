@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from app.services.log_store import RunLogBuffer, RunLogStore
+
+
+def test_get_since_returns_only_unread_lines() -> None:
+    store = RunLogStore(max_lines=5)
+    assert store.get_since("missing", 0) == ([], 0)
+    assert store.line_count("missing") == 0
+
+    for index in range(3):
+        store.append("run", f"line {index}")
+    lines, cursor = store.get_since("run", 0)
+    assert lines == ["line 0", "line 1", "line 2"]
+    assert cursor == 3
+    assert store.get_since("run", cursor) == ([], 3)
+
+    store.append("run", "line 3")
+    assert store.get_since("run", cursor) == (["line 3"], 4)
+    assert store.line_count("run") == 4
+
+
+def test_concurrent_appends_across_runs_keep_every_line() -> None:
+    store = RunLogStore()
+
+    def _write(run_id: str) -> None:
+        for index in range(200):
+            store.append(run_id, f"{run_id}:{index}")
+
+    threads = [threading.Thread(target=_write, args=(f"run-{worker}",)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for worker in range(8):
+        lines, cursor = store.get_since(f"run-{worker}", 0)
+        assert cursor == 200
+        assert lines == [f"run-{worker}:{index}" for index in range(200)]
+
+
+def test_log_buffer_flushes_on_size_interval_and_explicit_flush() -> None:
+    store = RunLogStore()
+    buffer = RunLogBuffer(store, "run", flush_size=3, flush_interval=60)
+    buffer.append("a")
+    buffer.append("b")
+    assert store.line_count("run") == 0
+    buffer.append("c")
+    assert store.get_since("run", 0) == (["a", "b", "c"], 3)
+
+    buffer.append("d")
+    buffer.flush()
+    assert store.get_since("run", 3) == (["d"], 4)
+
+    timed = RunLogBuffer(store, "timed", flush_size=100, flush_interval=0.01)
+    timed.append("late")
+    deadline = time.monotonic() + 2
+    while store.line_count("timed") == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert store.get_since("timed", 0) == (["late"], 1)
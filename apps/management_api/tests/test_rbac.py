@@ -1,5 +1,11 @@
 from __future__ import annotations
 
+import pytest
+from app.db.session import SessionLocal
+from app.models import AccessLevel, Pipeline, PipelineShare, Team, TeamMember, User
+from app.services.rbac import AuthContext, assert_pipeline_access
+from fastapi import HTTPException
+
 
 def _login(client, email: str, password: str) -> dict[str, str]:
     resp = client.post("/api/v1/auth/login", json={"email": email, "password": password})
@@ -35,3 +41,43 @@ def test_aiops_cannot_edit_pipeline_definition(client) -> None:
         json={"name": "Should Fail"},
     )
     assert patch_resp.status_code == 403
+
+
+def test_team_share_grants_read_and_write_access() -> None:
+    with SessionLocal() as db:
+        owner = User(email="owner@example.com", full_name="Owner", hashed_password="x")
+        member = User(email="member@example.com", full_name="Member", hashed_password="x")
+        outsider = User(email="outsider@example.com", full_name="Outsider", hashed_password="x")
+        team = Team(name="share-team")
+        db.add_all([owner, member, outsider, team])
+        db.flush()
+        pipeline = Pipeline(external_id="shared", name="Shared", owner_user_id=owner.id, created_by=owner.id)
+        db.add_all([pipeline, TeamMember(team_id=team.id, user_id=member.id)])
+        db.flush()
+        share = PipelineShare(pipeline_id=pipeline.id, team_id=team.id, access_level=AccessLevel.READ)
+        db.add(share)
+        db.commit()
+
+        member_ctx = AuthContext(member.id, [])
+        assert assert_pipeline_access(db, member_ctx, pipeline.id).id == pipeline.id
+        with pytest.raises(HTTPException) as write_denied:
+            assert_pipeline_access(db, member_ctx, pipeline.id, write=True)
+        assert write_denied.value.status_code == 403
+        with pytest.raises(HTTPException) as read_denied:
+            assert_pipeline_access(db, AuthContext(outsider.id, []), pipeline.id)
+        assert read_denied.value.status_code == 403
+
+        share.access_level = AccessLevel.WRITE
+        db.commit()
+        assert assert_pipeline_access(db, member_ctx, pipeline.id, write=True).id == pipeline.id
+
+        db.delete(share)
+        pipeline.owner_team_id = team.id
+        db.commit()
+        assert assert_pipeline_access(db, member_ctx, pipeline.id, write=True).id == pipeline.id
+
+        pipeline.is_deleted = True
+        db.commit()
+        with pytest.raises(HTTPException) as missing:
+            assert_pipeline_access(db, member_ctx, pipeline.id)
+        assert missing.value.status_code == 404
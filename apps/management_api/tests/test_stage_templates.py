@@ -116,3 +116,13 @@ def test_video_template_chain_runs_successfully(tmp_path) -> None:
     assert first_record["video_id"] == "cam-1"
     assert "caption" in first_record
     assert first_record["incident"]["severity"] in {"LOW", "MEDIUM", "HIGH", "CRITICAL"}
+
+
+def test_template_executors_are_reused_for_identical_config() -> None:
+    def _stage(params: dict) -> StageDefinition:
+        return StageDefinition(stage_id="upper", name="Upper", stage_template="builtin.uppercase", params=params)
+
+    executor = build_stage_executor(_stage({"field": "text"}))
+    assert build_stage_executor(_stage({"field": "text"})) is executor
+    assert build_stage_executor(_stage({"field": "title"})) is not executor
+    assert executor.run([{"text": "abc"}]) == [{"text": "ABC"}]